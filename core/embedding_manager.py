@@ -5,6 +5,11 @@ OKAMIシステム全体で使用されるエンベディング処理を統一
 
 import os
 import time
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 import structlog
@@ -14,6 +19,34 @@ from openai import OpenAI
 logger = structlog.get_logger()
 
 
+def _simhash(text: str, ngram: int = 3) -> int:
+    """
+    テキストの64bit SimHashを計算
+
+    空白区切りに依存しないよう、正規化した文字n-gramを特徴量として使用
+    （日本語テキストにも対応）
+    """
+    normalized = " ".join(text.lower().split())
+    if len(normalized) <= ngram:
+        features = [normalized]
+    else:
+        features = [normalized[i:i + ngram] for i in range(len(normalized) - ngram + 1)]
+
+    weights = [0] * 64
+    for feature in features:
+        h = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
 class EmbeddingManager:
     """
     エンベディング生成を統一管理するクラス
@@ -36,13 +69,33 @@ class EmbeddingManager:
         # プロバイダー固有の初期化
         self._init_provider()
         
+        # エンベディングキャッシュ（完全一致 + SimHashによる近似一致）
+        # 近似一致は否定語の有無など意味の違う文も一致しうるため、既定で無効かつ検索クエリのみ対象
+        self.cache_size = int(self.provider_config.get("cache_size", 1024))
+        self.simhash_max_distance = int(self.provider_config.get("simhash_max_distance", -1))
+        self._embedding_cache: "OrderedDict[str, Tuple[List[float], int]]" = OrderedDict()
+        self._simhash_index: Dict[int, str] = {}
+        self._cache_lock = threading.Lock()
+        
+        # 再起動をまたいで再利用する永続キャッシュ（内容のSHA-256をキーにSQLiteへ保存、パス指定時のみ有効）
+        self._persistent_cache: Optional[sqlite3.Connection] = None
+        self._persistent_cache_lock = threading.Lock()
+        persistent_cache_path = self.provider_config.get(
+            "persistent_cache_path", os.getenv("EMBEDDING_CACHE_PATH", "")
+        )
+        if persistent_cache_path:
+            self._open_persistent_cache(persistent_cache_path)
+        
         # パフォーマンス追跡
         self.stats = {
             "total_requests": 0,
             "successful_requests": 0,
             "failed_requests": 0,
             "total_processing_time": 0.0,
-            "average_processing_time": 0.0
+            "average_processing_time": 0.0,
+            "cache_hits": 0,
+            "fuzzy_cache_hits": 0,
+            "persistent_cache_hits": 0
         }
         
         logger.info(
@@ -67,7 +120,10 @@ class EmbeddingManager:
                     "api_key": os.getenv("OPENAI_API_KEY", ""),
                     "batch_size": int(os.getenv("EMBEDDING_BATCH_SIZE", "10")),
                     "max_retries": int(os.getenv("EMBEDDING_MAX_RETRIES", "3")),
-                    "retry_delay": float(os.getenv("EMBEDDING_RETRY_DELAY", "1.0"))
+                    "retry_delay": float(os.getenv("EMBEDDING_RETRY_DELAY", "1.0")),
+                    "cache_size": int(os.getenv("EMBEDDING_CACHE_SIZE", "1024")),
+                    "simhash_max_distance": int(os.getenv("EMBEDDING_SIMHASH_MAX_DISTANCE", "-1")),
+                    "persistent_cache_path": os.getenv("EMBEDDING_CACHE_PATH", "")
                 }
             }
     
@@ -87,12 +143,13 @@ class EmbeddingManager:
         else:
             raise ValueError(f"Unsupported embedding provider: {self.provider}")
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings(self, texts: List[str], allow_fuzzy: bool = False) -> List[List[float]]:
         """
         テキストリストからエンベディングを生成
         
         Args:
             texts: エンベディングを生成するテキストのリスト
+            allow_fuzzy: SimHashによる近似一致のキャッシュを使用するか（検索クエリ用）
             
         Returns:
             エンベディングベクトルのリスト
@@ -101,16 +158,32 @@ class EmbeddingManager:
             return []
         
         start_time = time.time()
-        all_embeddings = []
+        # キャッシュにヒットしたものはそのまま使い、未ヒットのみ生成する
+        all_embeddings = [self._get_cached_embedding(text, allow_fuzzy) for text in texts]
+        missing = [i for i, embedding in enumerate(all_embeddings) if embedding is None]
         
         try:
+            # メモリ上に無いものは永続キャッシュを一括参照
+            if missing and self._persistent_cache is not None:
+                stored = self._load_persistent_embeddings([texts[i] for i in missing])
+                for i in missing:
+                    embedding = stored.get(texts[i])
+                    if embedding is not None:
+                        all_embeddings[i] = embedding
+                        self._cache_embedding(texts[i], embedding)
+                missing = [i for i in missing if all_embeddings[i] is None]
+            
             # バッチ処理で効率化
             batch_size = self.provider_config.get("batch_size", 10)
             
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
+            for i in range(0, len(missing), batch_size):
+                batch_indices = missing[i:i + batch_size]
+                batch = [texts[j] for j in batch_indices]
                 batch_embeddings = self._generate_batch(batch)
-                all_embeddings.extend(batch_embeddings)
+                for j, embedding in zip(batch_indices, batch_embeddings):
+                    all_embeddings[j] = embedding
+                    self._cache_embedding(texts[j], embedding)
+                self._store_persistent_embeddings(batch, batch_embeddings)
             
             # 統計更新
             processing_time = time.time() - start_time
@@ -119,6 +192,7 @@ class EmbeddingManager:
             logger.info(
                 "Embeddings generated successfully",
                 text_count=len(texts),
+                cached=len(texts) - len(missing),
                 processing_time=processing_time,
                 provider=self.provider
             )
@@ -130,6 +204,133 @@ class EmbeddingManager:
             logger.error(f"Failed to generate embeddings: {e}", provider=self.provider)
             raise
     
+    def _get_cached_embedding(self, text: str, allow_fuzzy: bool = False) -> Optional[List[float]]:
+        """
+        キャッシュからエンベディングを取得
+
+        完全一致が無く近似一致が許可されている場合、SimHashのハミング距離が
+        閾値以内のテキストをほぼ同一とみなしてそのエンベディングを再利用する
+
+        Args:
+            text: 検索するテキスト
+            allow_fuzzy: 近似一致を使用するか
+
+        Returns:
+            キャッシュ済みエンベディング、見つからない場合はNone
+        """
+        if self.cache_size <= 0:
+            return None
+        
+        use_fuzzy = allow_fuzzy and self.simhash_max_distance >= 0
+        fingerprint = _simhash(text) if use_fuzzy else None
+        
+        with self._cache_lock:
+            cached = self._embedding_cache.get(text)
+            if cached is not None:
+                self._embedding_cache.move_to_end(text)
+                self.stats["cache_hits"] += 1
+                return cached[0]
+            
+            if not use_fuzzy:
+                return None
+            
+            for cached_hash, cached_text in self._simhash_index.items():
+                if (fingerprint ^ cached_hash).bit_count() <= self.simhash_max_distance:
+                    self._embedding_cache.move_to_end(cached_text)
+                    self.stats["fuzzy_cache_hits"] += 1
+                    return self._embedding_cache[cached_text][0]
+        
+        return None
+    
+    def _cache_embedding(self, text: str, embedding: List[float]) -> None:
+        """エンベディングをキャッシュに保存（LRUで古いものから削除）"""
+        if self.cache_size <= 0:
+            return
+        
+        fingerprint = _simhash(text) if self.simhash_max_distance >= 0 else None
+        
+        with self._cache_lock:
+            self._embedding_cache[text] = (embedding, fingerprint)
+            self._embedding_cache.move_to_end(text)
+            if fingerprint is not None:
+                self._simhash_index.setdefault(fingerprint, text)
+            
+            while len(self._embedding_cache) > self.cache_size:
+                evicted_text, (_, evicted_hash) = self._embedding_cache.popitem(last=False)
+                if evicted_hash is not None and self._simhash_index.get(evicted_hash) == evicted_text:
+                    del self._simhash_index[evicted_hash]
+    
+    def clear_cache(self, persistent: bool = False) -> None:
+        """
+        エンベディングキャッシュをクリア
+
+        Args:
+            persistent: Trueの場合は永続キャッシュも削除（強制的に再エンベディングさせる）
+        """
+        with self._cache_lock:
+            self._embedding_cache.clear()
+            self._simhash_index.clear()
+        if persistent and self._persistent_cache is not None:
+            with self._persistent_cache_lock, self._persistent_cache:
+                self._persistent_cache.execute("DELETE FROM embeddings")
+    
+    def _open_persistent_cache(self, path: str) -> None:
+        """永続キャッシュ（SQLite）を開く。失敗時は永続キャッシュ無しで動作する"""
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+            )
+            conn.commit()
+            self._persistent_cache = conn
+        except Exception as e:
+            logger.warning("Failed to open persistent embedding cache", path=path, error=str(e))
+    
+    def _persistent_key(self, text: str) -> str:
+        """プロバイダー・モデル・内容ハッシュ（SHA-256先頭16バイト）からキーを生成"""
+        digest = hashlib.sha256(text.encode("utf-8")).digest()[:16].hex()
+        return f"{self.provider}:{self.model}:{digest}"
+    
+    def _load_persistent_embeddings(self, texts: List[str]) -> Dict[str, List[float]]:
+        """永続キャッシュからまとめて取得（テキスト -> エンベディング）"""
+        keys = {self._persistent_key(text): text for text in texts}
+        found: Dict[str, List[float]] = {}
+        try:
+            with self._persistent_cache_lock:
+                key_list = list(keys)
+                # SQLiteのバインド変数上限を超えないよう分割して問い合わせる
+                for start in range(0, len(key_list), 500):
+                    chunk = key_list[start:start + 500]
+                    rows = self._persistent_cache.execute(
+                        f"SELECT key, embedding FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[keys[key]] = array("d", blob).tolist()
+        except Exception as e:
+            logger.warning("Failed to read persistent embedding cache", error=str(e))
+            return {}
+        self.stats["persistent_cache_hits"] += len(found)
+        return found
+    
+    def _store_persistent_embeddings(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """生成したエンベディングを永続キャッシュに1トランザクションで保存"""
+        if self._persistent_cache is None:
+            return
+        try:
+            with self._persistent_cache_lock, self._persistent_cache:
+                self._persistent_cache.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)",
+                    [
+                        (self._persistent_key(text), array("d", embedding).tobytes())
+                        for text, embedding in zip(texts, embeddings)
+                    ]
+                )
+        except Exception as e:
+            logger.warning("Failed to write persistent embedding cache", error=str(e))
+    
     def _generate_batch(self, texts: List[str]) -> List[List[float]]:
         """
         テキストバッチのエンベディング生成（リトライ機能付き）
@@ -205,6 +406,19 @@ class EmbeddingManager:
         embeddings = self.generate_embeddings([text])
         return embeddings[0] if embeddings else []
     
+    def generate_query_embedding(self, text: str) -> List[float]:
+        """
+        検索クエリのエンベディング生成（設定時はSimHashの近似一致を再利用）
+        
+        Args:
+            text: 検索クエリ
+            
+        Returns:
+            エンベディングベクトル
+        """
+        embeddings = self.generate_embeddings([text], allow_fuzzy=True)
+        return embeddings[0] if embeddings else []
+    
     def _update_stats(self, text_count: int, success: bool, processing_time: float):
         """統計情報を更新"""
         self.stats["total_requests"] += 1
@@ -236,7 +450,10 @@ class EmbeddingManager:
             "successful_requests": 0,
             "failed_requests": 0,
             "total_processing_time": 0.0,
-            "average_processing_time": 0.0
+            "average_processing_time": 0.0,
+            "cache_hits": 0,
+            "fuzzy_cache_hits": 0,
+            "persistent_cache_hits": 0
         }
         logger.info("EmbeddingManager stats reset")
     
@@ -248,7 +465,8 @@ class EmbeddingManager:
             (is_healthy, status_message)
         """
         try:
-            test_embedding = self.generate_single_embedding("health check test")
+            # キャッシュを経由せず実際にプロバイダーへ問い合わせる
+            test_embedding = self._generate_batch(["health check test"])[0]
             if test_embedding and len(test_embedding) > 0:
                 return True, f"Healthy - {self.provider} provider working correctly"
             else:
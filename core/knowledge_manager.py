@@ -233,6 +233,57 @@ class KnowledgeManager:
         
         return knowledge_sources
 
+    def _resolve_knowledge_source(self, source: Any) -> Any:
+        """
+        文字列指定の知識ソースを知識ソースインスタンスに変換
+
+        Args:
+            source: 知識ソース（ファイルパス・文字列コンテンツ・知識ソースインスタンス）
+
+        Returns:
+            知識ソースインスタンス
+        """
+        if not isinstance(source, str):
+            return source
+
+        # 絶対パスの場合はそのまま、相対パスの場合はknowledge_dirと結合
+        if os.path.isabs(source):
+            full_path = source
+        else:
+            full_path = os.path.join(self.knowledge_dir, source)
+        
+        if os.path.exists(full_path):
+            return self.create_knowledge_source(full_path)
+        # 文字列コンテンツとして扱う
+        return StringKnowledgeSource(
+            content=source,
+            chunk_size=1000,
+            chunk_overlap=200
+        )
+
+    def _add_sources(self, registry: List[Any], sources: List[Any], **log_context: Any) -> int:
+        """
+        重複を除いて知識ソースを登録
+
+        既存ソースの文字列表現を一度だけ集合化し、ソースごとの全件比較を避ける
+
+        Returns:
+            追加したソース数
+        """
+        existing = {str(existing_source) for existing_source in registry}
+        added = 0
+        for source in sources:
+            knowledge_source = self._resolve_knowledge_source(source)
+            source_content = str(knowledge_source)
+            if source_content in existing:
+                logger.debug("Knowledge source already exists, skipping",
+                           source_type=type(knowledge_source).__name__, **log_context)
+                continue
+            existing.add(source_content)
+            registry.append(knowledge_source)
+            added += 1
+        return added
+
     def add_crew_knowledge(self, source: Any) -> None:
         """
         クルー全体の知識ソースを追加
@@ -240,34 +291,18 @@ class KnowledgeManager:
         Args:
             source: 知識ソース（文字列またはファイル等）
         """
-        if isinstance(source, str):
-            # 絶対パスの場合はそのまま、相対パスの場合はknowledge_dirと結合
-            if os.path.isabs(source):
-                full_path = source
-            else:
-                full_path = os.path.join(self.knowledge_dir, source)
-            
-            if os.path.exists(full_path):
-                knowledge_source = self.create_knowledge_source(full_path)
-            else:
-                # 文字列コンテンツとして扱う
-                knowledge_source = StringKnowledgeSource(
-                    content=source,
-                    chunk_size=1000,
-                    chunk_overlap=200
-                )
-        else:
-            knowledge_source = source
+        self.add_crew_knowledge_batch([source])
 
-        # 重複チェック
-        source_content = str(knowledge_source)
-        for existing_source in self.crew_sources:
-            if str(existing_source) == source_content:
-                logger.debug("Crew knowledge source already exists, skipping", source_type=type(knowledge_source).__name__)
-                return
+    def add_crew_knowledge_batch(self, sources: List[Any]) -> None:
+        """
+        クルー全体の知識ソースをまとめて追加
 
-        self.crew_sources.append(knowledge_source)
-        logger.info("Crew knowledge source added", source_type=type(knowledge_source).__name__)
+        Args:
+            sources: 知識ソースのリスト
+        """
+        added = self._add_sources(self.crew_sources, sources)
+        if added:
+            logger.info("Crew knowledge sources added", count=added)
 
     def add_agent_knowledge(self, agent_role: str, source: Any) -> None:
         """
@@ -277,42 +312,20 @@ class KnowledgeManager:
             agent_role: エージェントの役割名
             source: 知識ソース
         """
-        if agent_role not in self.agent_sources:
-            self.agent_sources[agent_role] = []
-
-        if isinstance(source, str):
-            # 絶対パスの場合はそのまま、相対パスの場合はknowledge_dirと結合
-            if os.path.isabs(source):
-                full_path = source
-            else:
-                full_path = os.path.join(self.knowledge_dir, source)
-            
-            if os.path.exists(full_path):
-                knowledge_source = self.create_knowledge_source(full_path)
-            else:
-                # 文字列コンテンツとして扱う
-                knowledge_source = StringKnowledgeSource(
-                    content=source,
-                    chunk_size=1000,
-                    chunk_overlap=200
-                )
-        else:
-            knowledge_source = source
+        self.add_agent_knowledge_batch(agent_role, [source])
 
-        # 重複チェック
-        source_content = str(knowledge_source)
-        for existing_source in self.agent_sources[agent_role]:
-            if str(existing_source) == source_content:
-                logger.debug("Agent knowledge source already exists, skipping", 
-                           agent_role=agent_role, source_type=type(knowledge_source).__name__)
-                return
+    def add_agent_knowledge_batch(self, agent_role: str, sources: List[Any]) -> None:
+        """
+        エージェント個別の知識ソースをまとめて追加
 
-        self.agent_sources[agent_role].append(knowledge_source)
-        logger.info(
-            "Agent knowledge source added",
-            agent_role=agent_role,
-            source_type=type(knowledge_source).__name__,
-        )
+        Args:
+            agent_role: エージェントの役割名
+            sources: 知識ソースのリスト
+        """
+        registry = self.agent_sources.setdefault(agent_role, [])
+        added = self._add_sources(registry, sources, agent_role=agent_role)
+        if added:
+            logger.info("Agent knowledge sources added", agent_role=agent_role, count=added)
 
     def get_crew_knowledge_config(self) -> Dict[str, Any]:
         """クルー全体の知識設定を取得"""
@@ -396,11 +409,12 @@ class KnowledgeManager:
         Returns:
             コレクション情報
         """
-        # 基本的な情報のみ返す
+        # 基本的な情報のみ返す（存在確認は一覧を作らず対象ディレクトリのみ確認）
+        storage_path = os.path.join(db_storage_path(), "knowledge", collection_name)
         return {
             'name': collection_name,
-            'exists': collection_name in self.list_collections(),
-            'storage_path': os.path.join(db_storage_path(), "knowledge", collection_name)
+            'exists': os.path.isdir(storage_path),
+            'storage_path': storage_path
         }
 
     def reset_knowledge(self, knowledge_type: str = "all") -> None:
@@ -105,7 +105,7 @@ class QdrantKnowledgeStorage:
             
             for query in queries:
                 # 統一されたEmbeddingManagerでクエリをエンベディング
-                query_embedding = self.embedding_manager.generate_single_embedding(query)
+                query_embedding = self.embedding_manager.generate_query_embedding(query)
                 
                 # Qdrantで検索
                 results = self.vector_store.query(
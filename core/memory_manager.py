@@ -20,6 +20,24 @@ from utils.mem0_helper import mem0_error_handler, Mem0StatusChecker
 logger = structlog.get_logger()
 
 
+def _parse_ver(v: str) -> tuple:
+    """バージョン文字列を (major, minor, patch) のタプルに変換"""
+    try:
+        parts = [int(p) for p in v.split(".")[:3]]
+        while len(parts) < 3:
+            parts.append(0)
+        return tuple(parts)
+    except Exception:
+        return (0, 0, 0)
+
+
+# crewai バージョン差異に対応（インポート時に一度だけ解析）
+_CREWAI_VER = _parse_ver(getattr(_crewai_pkg, "__version__", "0.0.0"))
+
+# mem0 external memory 用 embedder 設定の共通部分（インスタンスごとの値のみ後でマージ）
+_MEM0_EMBEDDER_BASE_CONFIG: Dict[str, Any] = {"api_version": "v2"}
+
+
 class MemoryManager:
     """OKAMIエージェントの全メモリを管理するクラス（CrewAI 0.157.0対応）"""
 
@@ -48,6 +66,11 @@ class MemoryManager:
         self.fallback_to_basic = fallback_to_basic
         self.external_memory = None
         self.mem0_initialized = False
+        # グラフメモリは初回アクセス時に構築（起動時のグラフ読み込みを回避）
+        self._graph_memory: Optional[GraphMemoryManager] = None
+        self._kg_integration: Optional[KnowledgeGraphIntegration] = None
+        # 統合層に渡すKnowledgeManager（CrewFactoryで別途管理・設定される）
+        self.knowledge_manager = None
 
         # Ensure storage directory exists
         Path(self.storage_path).mkdir(parents=True, exist_ok=True)
@@ -56,18 +79,6 @@ class MemoryManager:
         if self.use_mem0:
             self._init_external_memory_with_fallback()
         
-        # Initialize graph memory if enabled
-        if self.use_graph_memory:
-            self.graph_memory = GraphMemoryManager()
-            # KnowledgeManagerは別途CrewFactoryで管理されるため、ここではNoneを渡す
-            self.kg_integration = KnowledgeGraphIntegration(
-                knowledge_manager=None,
-                graph_memory=self.graph_memory
-            )
-        else:
-            self.graph_memory = None
-            self.kg_integration = None
-
         logger.info(
             "Memory Manager initialized",
             storage_path=self.storage_path,
@@ -76,6 +87,23 @@ class MemoryManager:
             fallback_mode=not self.mem0_initialized and self.fallback_to_basic
         )
 
+    @property
+    def graph_memory(self) -> Optional[GraphMemoryManager]:
+        """グラフメモリ（初回アクセス時に遅延初期化）"""
+        if self._graph_memory is None and self.use_graph_memory:
+            self._graph_memory = GraphMemoryManager()
+        return self._graph_memory
+
+    @property
+    def kg_integration(self) -> Optional[KnowledgeGraphIntegration]:
+        """知識グラフ統合層（初回アクセス時に遅延初期化）"""
+        if self._kg_integration is None and self.use_graph_memory:
+            self._kg_integration = KnowledgeGraphIntegration(
+                knowledge_manager=self.knowledge_manager,
+                graph_memory=self.graph_memory
+            )
+        return self._kg_integration
+
     def _init_external_memory_with_fallback(self) -> None:
         """外部メモリ（Mem0）初期化（エラー許容モード）"""
         if not self.use_mem0:
@@ -89,29 +117,17 @@ class MemoryManager:
             return
         
         try:
-            # crewai バージョン差異に対応
-            def _parse_ver(v: str):
-                try:
-                    parts = [int(p) for p in v.split(".")[:3]]
-                    while len(parts) < 3:
-                        parts.append(0)
-                    return tuple(parts)
-                except Exception:
-                    return (0, 0, 0)
-
-            _ver = _parse_ver(getattr(_crewai_pkg, "__version__", "0.0.0"))
-
-            # 安定動作のため、CrewAI バージョンに関わらず mem0 を external memory として明示
+            # 安定動作のため、CrewAI バージョン（_CREWAI_VER）に関わらず mem0 を external memory として明示
             self.external_memory = ExternalMemory(
                 embedder_config={
                     "provider": "mem0",
                     "config": {
+                        **_MEM0_EMBEDDER_BASE_CONFIG,
                         "user_id": self.mem0_config.get("user_id", "okami_system"),
                         "run_id": self.mem0_config.get("run_id"),
                         "org_id": self.mem0_config.get("org_id"),
                         "project_id": self.mem0_config.get("project_id"),
                         "api_key": mem0_api_key,
-                        "api_version": "v2"
                     }
                 }
             )
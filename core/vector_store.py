@@ -4,60 +4,109 @@ QdrantとChromaDBの両方をサポート
 """
 
 import os
-from typing import List, Dict, Any, Optional, Literal
-from abc import ABC, abstractmethod
+import copy
+import asyncio
+import threading
+from typing import List, Dict, Any, Optional, Literal, Protocol
 import structlog
-# from qdrant_client import QdrantClient
-# from qdrant_client.models import (
-#     Distance, 
-#     VectorParams, 
-#     PointStruct,
-#     Filter,
-#     FieldCondition,
-#     MatchValue
-# )
 import chromadb
 try:
     from chromadb.config import Settings as ChromaSettings  # 0.5.x
 except Exception:  # pragma: no cover
     ChromaSettings = None
-import uuid
+import json
+import hashlib
+from collections import OrderedDict
+import numpy as np
+try:
+    import orjson  # 高速なJSONシリアライザ（任意依存）
+except ImportError:  # pragma: no cover
+    orjson = None
 
 logger = structlog.get_logger()
 
 
-class VectorStore(ABC):
-    """ベクトルストアの抽象基底クラス"""
+# 同一ディレクトリ/ホストへのクライアントをプロセス内で共有するプール
+# （PersistentClientの多重生成によるSQLite/HNSWインデックスの重複ロードを防ぐ）
+_CLIENT_POOL: Dict[tuple, Any] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+# クエリ結果のLRUキャッシュ（プール済みクライアントごと・コレクションごとに分割、CHROMA_QUERY_CACHE_SIZE指定時のみ）
+# 同じクライアントを共有する全インスタンスでupsert/deleteによる無効化が効くようにする
+# 結果は呼び出し側で変更されても影響しないよう、保存時と取得時にコピーする
+_QUERY_CACHE_POOL: Dict[tuple, Dict[str, "OrderedDict[tuple, Dict[str, Any]]"]] = {}
+_QUERY_CACHE_LOCK = threading.Lock()
+# コレクションごとの無効化回数。クエリ実行中に無効化された場合は古い結果をキャッシュしない
+_QUERY_GENERATION_POOL: Dict[tuple, Dict[str, int]] = {}
+_SEMANTIC_CACHE_POOL: Dict[tuple, "SemanticCache"] = {}
+
+
+def _dumps(value: Any) -> str:
+    """ネストしたメタデータ値をJSON文字列に変換（orjsonが利用可能なら使用）"""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _serialize_metadatas(metadatas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    ChromaDBはスカラー値のメタデータのみ受け付けるため、
+    dict/list の値を事前にJSON文字列へシリアライズする
+    """
+    return [
+        {k: (_dumps(v) if isinstance(v, (dict, list)) else v) for k, v in m.items()}
+        if any(isinstance(v, (dict, list)) for v in m.values()) else m
+        for m in metadatas
+    ]
+
+
+def _generate_ids(n: int) -> List[str]:
+    """
+    n件分のランダムID（UUID4相当の32桁hex）を一括生成
+
+    os.urandomを1回だけ呼び、UUIDオブジェクトを生成せずにhex文字列へ変換する
+    """
+    raw = os.urandom(16 * n)
+    return [raw[i:i + 16].hex() for i in range(0, 16 * n, 16)]
+
+
+class VectorStore(Protocol):
+    """ベクトルストアの共通インターフェース（静的型チェック用のProtocol）"""
+    
+    # 実装クラスが__slots__を使えるよう、基底では__dict__を持たせない
+    __slots__ = ()
     
-    @abstractmethod
     def create_collection(self, name: str, dimension: int) -> None:
         """コレクションを作成"""
         pass
     
-    @abstractmethod
     def upsert(self, collection_name: str, embeddings: List[List[float]], 
                documents: List[str], metadatas: List[Dict[str, Any]], 
-               ids: Optional[List[str]] = None) -> None:
+               ids: Optional[List[str]] = None, batch_size: Optional[int] = None) -> None:
         """ベクトルとメタデータを挿入/更新"""
         pass
     
-    @abstractmethod
     def query(self, collection_name: str, query_embedding: List[float], 
               n_results: int = 10, filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """ベクトル検索を実行"""
         pass
     
-    @abstractmethod
-    def delete(self, collection_name: str, ids: List[str]) -> None:
+    def query_batch(self, collection_name: str, query_embeddings: List[List[float]],
+                    n_results: int = 10, filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """複数ベクトルの検索を一括実行"""
+        pass
+    
+    def delete(self, collection_name: str, ids: List[str], batch_size: int = 1000) -> None:
         """IDによって削除"""
         pass
     
-    @abstractmethod
     def list_collections(self) -> List[str]:
         """コレクション一覧を取得"""
         pass
 
 
+# 再有効化する場合は qdrant_client から QdrantClient と models
+# (Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue) をインポートする
 # class QdrantVectorStore(VectorStore):
 #     """Qdrantベクトルストアの実装（無効化中）"""
 #     def __init__(self, host: str = None, port: int = None, grpc_port: int = None):
@@ -90,23 +139,13 @@ class VectorStore(ABC):
 #         """ベクトルとメタデータを挿入/更新"""
 #         try:
 #             if ids is None:
-#                 ids = [str(uuid.uuid4()) for _ in embeddings]
+#                 ids = _generate_ids(len(embeddings))
             
-#             points = []
-#             for i, (embedding, doc, metadata, point_id) in enumerate(
-#                 zip(embeddings, documents, metadatas, ids)
-#             ):
-#                 # メタデータにドキュメントテキストを含める
-#                 payload = metadata.copy()
-#                 payload["text"] = doc
-                
-#                 points.append(
-#                     PointStruct(
-#                         id=point_id,
-#                         vector=embedding,
-#                         payload=payload
-#                     )
-#                 )
+#             # メタデータにドキュメントテキストを含める
+#             points = [
+#                 PointStruct(id=point_id, vector=embedding, payload={**metadata, "text": doc})
+#                 for point_id, embedding, doc, metadata in zip(ids, embeddings, documents, metadatas)
+#             ]
             
 #             self.client.upsert(
 #                 collection_name=collection_name,
@@ -144,18 +183,13 @@ class VectorStore(ABC):
 #             )
             
 #             # CrewAI互換の形式に変換
-#             ids = []
-#             documents = []
-#             metadatas = []
-#             distances = []
-            
-#             for result in results:
-#                 ids.append(str(result.id))
-#                 documents.append(result.payload.get("text", ""))
-#                 # textフィールドを除いたメタデータ
-#                 metadata = {k: v for k, v in result.payload.items() if k != "text"}
-#                 metadatas.append(metadata)
-#                 distances.append(1 - result.score)  # cosine距離に変換
+#             ids = [str(result.id) for result in results]
+#             # payloadは結果ごとに新規生成されるため、コピーせずtextを取り出す
+#             metadatas = [result.payload for result in results]
+#             documents = [metadata.pop("text", "") for metadata in metadatas]
+#             # cosine類似度をcosine距離に一括変換
+#             scores = np.fromiter((result.score for result in results), dtype=np.float64, count=len(results))
+#             distances = (1.0 - scores).tolist()
             
 #             return {
 #                 "ids": [ids],
@@ -189,9 +223,120 @@ class VectorStore(ABC):
 #             raise
 
 
+class SemanticCache:
+    """
+    類似クエリ向けのセマンティックキャッシュ
+
+    直近のクエリ埋め込み（正規化済みfloat32行列）と検索結果を保持し、
+    新しいクエリとのコサイン類似度が閾値以上なら保存済みの結果を返す。
+    閾値はコレクションごとに、ミス時の最大類似度のEWMA（平均+2σ）で引き上げる。
+    """
+    
+    __slots__ = ("threshold", "maxsize", "alpha", "_partitions", "_score_stats", "_tick", "_lock")
+    
+    def __init__(self, threshold: float = 0.95, maxsize: int = 4096, alpha: float = 0.1):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.alpha = alpha
+        # (collection, n_results, filter_key) -> {"vectors", "results", "ticks", "size"}
+        self._partitions: Dict[tuple, Dict[str, Any]] = {}
+        # collection -> [EWMA平均, EWMA分散]
+        self._score_stats: Dict[str, List[float]] = {}
+        self._tick = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> Optional[np.ndarray]:
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return np.asarray(vector, dtype=np.float32) / norm
+    
+    def _threshold_for(self, collection_name: str) -> float:
+        stats = self._score_stats.get(collection_name)
+        if stats is None:
+            return self.threshold
+        mean, var = stats
+        return max(self.threshold, min(0.999, mean + 2 * var ** 0.5))
+    
+    def _observe(self, collection_name: str, score: float) -> None:
+        stats = self._score_stats.get(collection_name)
+        if stats is None:
+            self._score_stats[collection_name] = [score, 0.0]
+            return
+        diff = score - stats[0]
+        stats[0] += self.alpha * diff
+        stats[1] = (1 - self.alpha) * (stats[1] + self.alpha * diff * diff)
+    
+    def get(self, collection_name: str, query_embedding: np.ndarray, key: tuple) -> Optional[Dict[str, Any]]:
+        """類似度が閾値以上のキャッシュ済み結果を取得"""
+        q = self._normalize(query_embedding)
+        if q is None:
+            return None
+        with self._lock:
+            part = self._partitions.get((collection_name,) + key)
+            if part is None or part["size"] == 0:
+                return None
+            scores = part["vectors"][:part["size"]] @ q
+            best = int(scores.argmax())
+            score = float(scores[best])
+            if score >= self._threshold_for(collection_name):
+                self._tick += 1
+                part["ticks"][best] = self._tick
+                return copy.deepcopy(part["results"][best])
+            self._observe(collection_name, score)
+            return None
+    
+    def put(self, collection_name: str, query_embedding: np.ndarray, key: tuple,
+            results: Dict[str, Any]) -> None:
+        """クエリ結果を保存（上限超過時は最も古く使われたエントリを置き換える）"""
+        q = self._normalize(query_embedding)
+        if q is None:
+            return
+        with self._lock:
+            part = self._partitions.get((collection_name,) + key)
+            if part is None or part["vectors"].shape[1] != q.shape[0]:
+                part = self._partitions[(collection_name,) + key] = {
+                    "vectors": np.empty((min(16, self.maxsize), q.shape[0]), dtype=np.float32),
+                    "results": [],
+                    "ticks": [],
+                    "size": 0,
+                }
+            results = copy.deepcopy(results)
+            self._tick += 1
+            size = part["size"]
+            if size >= self.maxsize:
+                slot = int(np.argmin(part["ticks"]))
+                part["results"][slot] = results
+                part["ticks"][slot] = self._tick
+            else:
+                if size == part["vectors"].shape[0]:
+                    grown = np.empty((min(size * 2, self.maxsize), q.shape[0]), dtype=np.float32)
+                    grown[:size] = part["vectors"]
+                    part["vectors"] = grown
+                slot = size
+                part["results"].append(results)
+                part["ticks"].append(self._tick)
+                part["size"] = size + 1
+            part["vectors"][slot] = q
+    
+    def invalidate(self, collection_name: str) -> None:
+        """コレクションに属するエントリを全て破棄"""
+        with self._lock:
+            for key in [k for k in self._partitions if k[0] == collection_name]:
+                del self._partitions[key]
+
+
 class ChromaVectorStore(VectorStore):
     """ChromaDBベクトルストアの実装（後方互換性のため）"""
     
+    __slots__ = (
+        "host", "port", "persist_directory", "client",
+        "query_cache_size", "_query_buf", "_collections", "_query_cache", "_query_generations",
+        "_semantic_cache",
+        "add_max_retries", "add_retry_initial_delay", "query_max_retries", "query_retry_initial_delay",
+    )
+    
     def __init__(self, host: str = None, port: int = None, persist_directory: str = None):
         """
         ChromaDBクライアントを初期化
@@ -205,21 +350,12 @@ class ChromaVectorStore(VectorStore):
         self.port = port or int(os.getenv("CHROMA_PORT", "8000"))
         self.persist_directory = persist_directory or os.getenv("CHROMA_PERSIST_DIRECTORY", "./storage/chroma")
         
-        # 永続化ディレクトリが指定されている場合はPersistentClientを使用
-        if self.persist_directory and self.persist_directory != "":
-            # ディレクトリが存在しない場合は作成
-            os.makedirs(self.persist_directory, exist_ok=True)
-            # テレメトリ無効化などの設定（ネットワーク依存を避ける）
-            if ChromaSettings is not None:
-                settings = ChromaSettings(anonymized_telemetry=False)
-                self.client = chromadb.PersistentClient(path=self.persist_directory, settings=settings)
-            else:
-                self.client = chromadb.PersistentClient(path=self.persist_directory)
-        else:
-            self.client = chromadb.HttpClient(
-                host=self.host,
-                port=self.port
-            )
+        self.client = self._get_pooled_client()
+        self.query_cache_size = int(os.getenv("CHROMA_QUERY_CACHE_SIZE", "0"))
+        # 単一クエリ用の再利用バッファ（次元ごと・スレッドごと）
+        self._query_buf = threading.local()
+        # コレクションハンドルのキャッシュ（操作ごとのget_collection往復を避ける）
+        self._collections: Dict[str, Any] = {}
         # タイムアウト/リトライ設定（環境変数で調整可）
         self.add_max_retries = int(os.getenv("CHROMA_ADD_MAX_RETRIES", "3"))
         self.add_retry_initial_delay = float(os.getenv("CHROMA_ADD_RETRY_INITIAL_DELAY", "0.2"))
@@ -233,101 +369,369 @@ class ChromaVectorStore(VectorStore):
             persist_directory=self.persist_directory
         )
     
+    def _get_pooled_client(self) -> Any:
+        """プールからクライアントを取得（未作成の場合のみ生成）"""
+        if self.persist_directory and self.persist_directory != "":
+            key = ("persistent", os.path.abspath(self.persist_directory))
+        else:
+            key = ("http", self.host, self.port)
+        
+        with _CLIENT_POOL_LOCK:
+            client = _CLIENT_POOL.get(key)
+            if client is None:
+                client = self._create_client()
+                _CLIENT_POOL[key] = client
+            self._query_cache = _QUERY_CACHE_POOL.setdefault(key, {})
+            self._query_generations = _QUERY_GENERATION_POOL.setdefault(key, {})
+            # 類似クエリのキャッシュは誤ヒットの可能性があるため閾値指定時のみ有効
+            threshold = os.getenv("CHROMA_SEMANTIC_CACHE_THRESHOLD")
+            self._semantic_cache = None
+            if threshold:
+                self._semantic_cache = _SEMANTIC_CACHE_POOL.get(key)
+                if self._semantic_cache is None:
+                    self._semantic_cache = _SEMANTIC_CACHE_POOL[key] = SemanticCache(
+                        threshold=float(threshold),
+                        maxsize=int(os.getenv("CHROMA_SEMANTIC_CACHE_SIZE", "4096"))
+                    )
+            return client
+    
+    def _create_client(self) -> Any:
+        """ChromaDBクライアントを生成"""
+        # 永続化ディレクトリが指定されている場合はPersistentClientを使用
+        if self.persist_directory and self.persist_directory != "":
+            # ディレクトリが存在しない場合は作成
+            os.makedirs(self.persist_directory, exist_ok=True)
+            # テレメトリ無効化などの設定（ネットワーク依存を避ける）
+            if ChromaSettings is not None:
+                settings = ChromaSettings(anonymized_telemetry=False)
+                return chromadb.PersistentClient(path=self.persist_directory, settings=settings)
+            return chromadb.PersistentClient(path=self.persist_directory)
+        
+        client = chromadb.HttpClient(
+            host=self.host,
+            port=self.port
+        )
+        self._tune_http_pool(client)
+        return client
+    
+    @staticmethod
+    def _tune_http_pool(client: Any) -> None:
+        """
+        HttpClientのhttpxコネクションプールを拡張（CHROMA_HTTP_POOL_SIZE指定時のみ）
+
+        chromadbのHttpClientはhttpx既定のLimits（同時接続100・keep-alive 20）を使うため、
+        多数のエージェントが並行して書き込む場合にkeep-alive接続を使い回せるよう拡張する。
+        ローカル/単一接続の環境では効果が無いため既定では変更しない。
+        TLS検証・認証・タイムアウトなど既存セッションの設定は新しいセッションに引き継ぐ。
+        """
+        pool_size = os.getenv("CHROMA_HTTP_POOL_SIZE")
+        if not pool_size:
+            return
+        try:
+            import httpx
+            server = getattr(client, "_server", None)
+            session = getattr(server, "_session", None)
+            if session is None:
+                return
+            size = int(pool_size)
+            # TLS検証設定はセッションから取得できないため、クライアントの設定から復元する
+            verify = getattr(getattr(server, "_settings", None), "chroma_server_ssl_verify", None)
+            server._session = httpx.Client(
+                auth=session.auth,
+                params=session.params,
+                headers=session.headers,
+                cookies=session.cookies,
+                verify=True if verify is None else verify,
+                timeout=session.timeout,
+                follow_redirects=session.follow_redirects,
+                limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+                event_hooks=session.event_hooks,
+                base_url=session.base_url,
+                trust_env=session.trust_env,
+            )
+            session.close()
+            logger.info("Chroma HTTP connection pool resized", pool_size=size)
+        except Exception as e:
+            logger.warning("Failed to resize Chroma HTTP connection pool", error=str(e))
+    
     def create_collection(self, name: str, dimension: int) -> None:
         """コレクションを作成"""
         try:
-            self.client.get_or_create_collection(name=name)
+            self._collections[name] = self.client.get_or_create_collection(name=name)
             logger.info(f"Created/retrieved collection {name}")
         except Exception as e:
             logger.error(f"Failed to create collection {name}: {e}")
             raise
     
+    def delete_collection(self, name: str) -> None:
+        """コレクションを削除"""
+        try:
+            self.client.delete_collection(name=name)
+            logger.info(f"Deleted collection {name}")
+        except Exception as e:
+            logger.error(f"Failed to delete collection {name}: {e}")
+            raise
+        finally:
+            self._collections.pop(name, None)
+            self._invalidate_query_cache(name)
+    
+    def _get_collection(self, name: str) -> Any:
+        """コレクションハンドルを取得（初回のみサーバーに問い合わせる）"""
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = self.client.get_collection(name=name)
+        return collection
+    
     def upsert(self, collection_name: str, embeddings: List[List[float]], 
                documents: List[str], metadatas: List[Dict[str, Any]], 
-               ids: Optional[List[str]] = None) -> None:
-        """ベクトルとメタデータを挿入/更新"""
+               ids: Optional[List[str]] = None, batch_size: Optional[int] = None) -> None:
+        """
+        ベクトルとメタデータを挿入/更新
+
+        大量データはbatch_sizeごとに分割して送信する
+        （未指定時はクライアントの最大バッチサイズ、取得できなければ CHROMA_UPSERT_BATCH_SIZE）
+        """
         try:
-            collection = self.client.get_collection(name=collection_name)
+            collection = self._get_collection(collection_name)
             
             if ids is None:
-                ids = [str(uuid.uuid4()) for _ in embeddings]
+                ids = _generate_ids(len(embeddings))
             
-            # リトライ付きでupsert（NFS上のロック競合・I/O遅延に対応）
-            attempt = 0
-            delay = self.add_retry_initial_delay
-            while True:
-                try:
-                    collection.upsert(
-                        embeddings=embeddings,
-                        documents=documents,
-                        metadatas=metadatas,
-                        ids=ids
-                    )
-                    break
-                except Exception as e:
-                    attempt += 1
-                    if attempt > self.add_max_retries:
-                        raise
-                    logger.warning(
-                        "Chroma upsert timed out/failed, retrying",
-                        attempt=attempt,
-                        max_retries=self.add_max_retries,
-                        error=str(e)
+            # Chroma内部での行ごとの変換を避けるため、連続したfloat32配列に一括変換
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+            metadatas = _serialize_metadatas(metadatas)
+            
+            if batch_size is None:
+                batch_size = self._get_upsert_batch_size()
+            # 分割はnumpyのビュー/リストのスライスのみで、データのコピーは発生しない
+            try:
+                for start in range(0, len(ids), batch_size):
+                    end = start + batch_size
+                    self._upsert_with_retry(
+                        collection,
+                        embeddings[start:end],
+                        documents[start:end],
+                        metadatas[start:end],
+                        ids[start:end]
                     )
-                    import time
-                    time.sleep(delay)
-                    delay = min(delay * 2, 3.0)  # 指数バックオフ（上限3秒）
+            finally:
+                # 途中で失敗しても一部は書き込まれている可能性があるため必ず無効化
+                self._invalidate_query_cache(collection_name)
             logger.info(f"Upserted {len(embeddings)} items to {collection_name}")
         except Exception as e:
+            # 他プロセスで削除/再作成された場合に備え、失敗時はハンドルを破棄
+            self._collections.pop(collection_name, None)
             logger.error(f"Failed to upsert to {collection_name}: {e}")
             raise
     
+    def _get_upsert_batch_size(self) -> int:
+        """1リクエストあたりのupsert件数を決定"""
+        batch_size = int(os.getenv("CHROMA_UPSERT_BATCH_SIZE", "256"))
+        try:
+            return min(batch_size, self.client.get_max_batch_size())
+        except Exception:
+            return batch_size
+    
+    def _upsert_with_retry(self, collection: Any, embeddings: np.ndarray,
+                           documents: List[str], metadatas: List[Dict[str, Any]],
+                           ids: List[str]) -> None:
+        """リトライ付きでupsert（NFS上のロック競合・I/O遅延に対応）"""
+        attempt = 0
+        delay = self.add_retry_initial_delay
+        while True:
+            try:
+                collection.upsert(
+                    embeddings=embeddings,
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=ids
+                )
+                return
+            except Exception as e:
+                attempt += 1
+                if attempt > self.add_max_retries:
+                    raise
+                logger.warning(
+                    "Chroma upsert timed out/failed, retrying",
+                    attempt=attempt,
+                    max_retries=self.add_max_retries,
+                    error=str(e)
+                )
+                import time
+                time.sleep(delay)
+                delay = min(delay * 2, 3.0)  # 指数バックオフ（上限3秒）
+    
     def query(self, collection_name: str, query_embedding: List[float], 
               n_results: int = 10, filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """ベクトル検索を実行"""
         try:
-            collection = self.client.get_collection(name=collection_name)
+            query_embeddings = self._get_query_buffer(len(query_embedding))
+            query_embeddings[0] = query_embedding
             
-            # リトライ付きでquery
-            attempt = 0
-            delay = self.query_retry_initial_delay
-            while True:
-                try:
-                    results = collection.query(
-                        query_embeddings=[query_embedding],
-                        n_results=n_results,
-                        where=filter
-                    )
-                    break
-                except Exception as e:
-                    attempt += 1
-                    if attempt > self.query_max_retries:
-                        raise
-                    logger.warning(
-                        "Chroma query timed out/failed, retrying",
-                        attempt=attempt,
-                        max_retries=self.query_max_retries,
-                        error=str(e)
-                    )
-                    import time
-                    time.sleep(delay)
-                    delay = min(delay * 2, 3.0)
+            cache_key = None
+            if self.query_cache_size > 0 or self._semantic_cache is not None:
+                cache_key = self._make_query_cache_key(query_embeddings, n_results, filter)
+            if self.query_cache_size > 0:
+                cached = self._get_cached_query(collection_name, cache_key)
+                if cached is not None:
+                    return cached
+            if self._semantic_cache is not None:
+                cached = self._semantic_cache.get(collection_name, query_embeddings[0], cache_key[1:])
+                if cached is not None:
+                    return cached
             
+            generation = self._query_generations.get(collection_name, 0)
+            collection = self._get_collection(collection_name)
+            results = self._query_with_retry(collection, query_embeddings, n_results, filter)
+            if cache_key is not None:
+                self._cache_query(collection_name, cache_key, query_embeddings[0], results, generation)
             return results
         except Exception as e:
+            self._collections.pop(collection_name, None)
             logger.error(f"Failed to query {collection_name}: {e}")
             raise
     
-    def delete(self, collection_name: str, ids: List[str]) -> None:
-        """IDによって削除"""
+    def query_batch(self, collection_name: str, query_embeddings: List[List[float]],
+                    n_results: int = 10, filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        複数ベクトルの検索を1リクエストで実行
+
+        戻り値の外側リストはクエリ数と同じ長さ（results["documents"][i] がi番目のクエリの結果）
+        """
         try:
-            collection = self.client.get_collection(name=collection_name)
-            collection.delete(ids=ids)
+            collection = self._get_collection(collection_name)
+            query_embeddings = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+            return self._query_with_retry(collection, query_embeddings, n_results, filter)
+        except Exception as e:
+            self._collections.pop(collection_name, None)
+            logger.error(f"Failed to batch query {collection_name}: {e}")
+            raise
+    
+    def _query_with_retry(self, collection: Any, query_embeddings: np.ndarray,
+                          n_results: int, filter: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """リトライ付きでcollection.queryを実行"""
+        attempt = 0
+        delay = self.query_retry_initial_delay
+        while True:
+            try:
+                return collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=n_results,
+                    where=filter
+                )
+            except Exception as e:
+                attempt += 1
+                if attempt > self.query_max_retries:
+                    raise
+                logger.warning(
+                    "Chroma query timed out/failed, retrying",
+                    attempt=attempt,
+                    max_retries=self.query_max_retries,
+                    error=str(e)
+                )
+                import time
+                time.sleep(delay)
+                delay = min(delay * 2, 3.0)
+    
+    @staticmethod
+    def _make_query_cache_key(query_embeddings: np.ndarray, n_results: int,
+                              filter: Optional[Dict[str, Any]]) -> tuple:
+        """クエリ埋め込み（float32バイト列のハッシュ）・件数・フィルタからキャッシュキーを生成"""
+        digest = hashlib.blake2b(query_embeddings.tobytes(), digest_size=16).digest()
+        filter_key = json.dumps(filter, sort_keys=True, default=str) if filter else None
+        return (digest, n_results, filter_key)
+    
+    def _get_cached_query(self, collection_name: str, key: tuple) -> Optional[Dict[str, Any]]:
+        """キャッシュ済みのクエリ結果を取得（ヒット時はLRU順を更新）"""
+        with _QUERY_CACHE_LOCK:
+            cache = self._query_cache.get(collection_name)
+            if cache is None or key not in cache:
+                return None
+            cache.move_to_end(key)
+            cached = cache[key]
+        # 保存済みの結果は変更されないため、コピーはロック外で行う
+        return copy.deepcopy(cached)
+    
+    def _cache_query(self, collection_name: str, key: tuple, query_embedding: np.ndarray,
+                     results: Dict[str, Any], generation: int) -> None:
+        """
+        クエリ結果をキャッシュ（コレクションごとにquery_cache_size件を上限とする）
+
+        クエリ開始時の無効化回数（generation）から変わっている場合は、
+        実行中に書き込まれた内容を反映していない可能性があるため保存しない。
+        """
+        if self.query_cache_size > 0:
+            copied = copy.deepcopy(results)
+        with _QUERY_CACHE_LOCK:
+            if self._query_generations.get(collection_name, 0) != generation:
+                return
+            if self.query_cache_size > 0:
+                cache = self._query_cache.setdefault(collection_name, OrderedDict())
+                cache[key] = copied
+                cache.move_to_end(key)
+                while len(cache) > self.query_cache_size:
+                    cache.popitem(last=False)
+            # 無効化との間に割り込まれないよう、類似クエリのキャッシュもロック内で保存する
+            if self._semantic_cache is not None:
+                self._semantic_cache.put(collection_name, query_embedding, key[1:], results)
+    
+    def _invalidate_query_cache(self, collection_name: str) -> None:
+        """コレクションの内容が変わったためクエリ結果キャッシュを破棄"""
+        with _QUERY_CACHE_LOCK:
+            self._query_generations[collection_name] = self._query_generations.get(collection_name, 0) + 1
+            self._query_cache.pop(collection_name, None)
+        if self._semantic_cache is not None:
+            self._semantic_cache.invalidate(collection_name)
+    
+    def _get_query_buffer(self, dimension: int) -> np.ndarray:
+        """(1, dimension) のfloat32バッファを取得（クエリごとの配列確保を避ける）"""
+        buffers = getattr(self._query_buf, "buffers", None)
+        if buffers is None:
+            buffers = self._query_buf.buffers = {}
+        buf = buffers.get(dimension)
+        if buf is None:
+            buf = buffers[dimension] = np.empty((1, dimension), dtype=np.float32)
+        return buf
+    
+    def delete(self, collection_name: str, ids: List[str], batch_size: int = 1000) -> None:
+        """
+        IDによって削除
+
+        大量のIDはbatch_sizeごとにまとめて発行し、呼び出し単位のWALフラッシュを抑える
+        """
+        try:
+            collection = self._get_collection(collection_name)
+            try:
+                for start in range(0, len(ids), batch_size):
+                    collection.delete(ids=ids[start:start + batch_size])
+            finally:
+                self._invalidate_query_cache(collection_name)
             logger.info(f"Deleted {len(ids)} items from {collection_name}")
         except Exception as e:
+            self._collections.pop(collection_name, None)
             logger.error(f"Failed to delete from {collection_name}: {e}")
             raise
     
+    async def aupsert(self, collection_name: str, embeddings: List[List[float]],
+                      documents: List[str], metadatas: List[Dict[str, Any]],
+                      ids: Optional[List[str]] = None, batch_size: Optional[int] = None) -> None:
+        """upsertの非同期版（イベントループをブロックしないようワーカースレッドで実行）"""
+        await asyncio.to_thread(self.upsert, collection_name, embeddings, documents, metadatas, ids, batch_size)
+    
+    async def aquery(self, collection_name: str, query_embedding: List[float],
+                     n_results: int = 10, filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """queryの非同期版（asyncio.gatherで複数検索を並行実行可能）"""
+        return await asyncio.to_thread(self.query, collection_name, query_embedding, n_results, filter)
+    
+    async def aquery_batch(self, collection_name: str, query_embeddings: List[List[float]],
+                           n_results: int = 10, filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """query_batchの非同期版"""
+        return await asyncio.to_thread(self.query_batch, collection_name, query_embeddings, n_results, filter)
+    
+    async def adelete(self, collection_name: str, ids: List[str], batch_size: int = 1000) -> None:
+        """deleteの非同期版"""
+        await asyncio.to_thread(self.delete, collection_name, ids, batch_size)
+    
     def list_collections(self) -> List[str]:
         """コレクション一覧を取得"""
         try:
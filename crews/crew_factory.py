@@ -4,33 +4,244 @@ OKAMIシステム用クルーファクトリー
 """
 
 import os
+import re
+import json
+import hashlib
+import logging
+import tempfile
+import time
 import yaml
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType, SimpleNamespace
+from typing import Dict, Any, Mapping, Optional, List
 from pathlib import Path
 import structlog
 
+try:
+    import orjson  # 高速なJSONシリアライザ（任意依存）
+except ImportError:  # pragma: no cover
+    orjson = None
+
 from crewai import Crew, Agent, Task, LLM
-import crewai as _crewai_pkg
-from crewai.memory.external.external_memory import ExternalMemory
 from core.memory_manager import MemoryManager
 from core.knowledge_manager import KnowledgeManager
-from core.guardrail_manager import GuardrailManager
 from crewai import Process
-from crewai.project import CrewBase
 from utils.config import get_config
 from tools import get_mcp_tools_for_agent, search_knowledge, add_knowledge_to_base
 from tools.mcp_docker_tool import get_docker_tools
-from models.evolution_output import EvolutionChanges
 # knowledge_loaderは削除 - CrewAI標準のknowledge_sourcesを使用
-from guardrails import create_quality_guardrail, create_safety_guardrail, create_accuracy_guardrail
 from utils.helpers import truncate_dict
 
 logger = structlog.get_logger()
 
+# libyamlが利用可能ならCローダーで高速にパース（無ければ純Pythonのローダー）
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader
+    logger.warning(
+        "libyaml C loader unavailable, falling back to pure-Python YAML parser",
+        hint="install libyaml-dev and reinstall PyYAML to enable CSafeLoader"
+    )
+
+
+def _debug_logging_enabled() -> bool:
+    """
+    DEBUGログが実際に出力されるか
+
+    structlogのラッパー（make_filtering_bound_logger・stdlib.BoundLogger）と、
+    stdlib連携（utils.logger）時の出力先ロガーのレベルで判定し、INFO以上の運用では
+    設定ダンプ用のtruncate_dictを省略できるようにする。レベルを判定できない構成では出力するとみなす。
+    """
+    bound = structlog.get_logger(__name__).bind()
+    is_enabled_for = getattr(bound, "is_enabled_for", None)
+    if is_enabled_for is not None and not is_enabled_for(logging.DEBUG):
+        return False
+    if hasattr(bound, "isEnabledFor"):
+        return bound.isEnabledFor(logging.DEBUG)
+    # ラッパーが全レベルを通す場合も、stdlibロガーへ出力するならそのレベルで絞り込まれる
+    underlying = getattr(bound, "_logger", None)
+    if isinstance(underlying, logging.Logger):
+        return underlying.isEnabledFor(logging.DEBUG)
+    return True
+
+
+# reload_configsの連続呼び出しをまとめる間隔（秒）
+_RELOAD_MIN_INTERVAL = float(os.environ.get("OKAMI_CONFIG_RELOAD_INTERVAL", "0.5"))
+
+# 非推奨設定ファイルのマーカー（ファイル先頭部分のみ検索）
+_DEPRECATED_MARKER = re.compile(rb"deprecated", re.IGNORECASE)
+
+# パース済み設定のディスクキャッシュ（プロセス再起動後もYAMLを再パースしない）
+# OKAMI_CONFIG_CACHE_DIRでディレクトリを指定した場合のみ有効。内容のSHA-256をキーにJSONで保存する
+_CONFIG_CACHE_DIR = os.environ.get("OKAMI_CONFIG_CACHE_DIR", "")
+# パース・スキップ判定の仕様を変えた場合は上げて、古いキャッシュを無効化する
+_CONFIG_CACHE_VERSION = 2
+
+
+def _json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _config_cache_file(file_path: str) -> str:
+    """設定ファイルに対応するディスクキャッシュのパス"""
+    return os.path.join(_CONFIG_CACHE_DIR, hashlib.sha1(file_path.encode("utf-8")).hexdigest() + ".json")
+
+
+def _load_disk_cached_config(file_path: str, digest: str) -> tuple:
+    """
+    ディスクキャッシュからパース結果を取得
+
+    Args:
+        file_path: 設定ファイルのパス
+        digest: 設定ファイル内容のSHA-256
+
+    Returns:
+        (ヒットしたか, 設定内容)。非推奨ファイルは内容Noneとしてキャッシュされる
+    """
+    if not _CONFIG_CACHE_DIR:
+        return False, None
+    try:
+        with open(_config_cache_file(file_path), "rb") as f:
+            cached = _json_loads(f.read())
+    except Exception:
+        return False, None
+    if not isinstance(cached, dict) or cached.get("key") != [_CONFIG_CACHE_VERSION, file_path, digest]:
+        return False, None
+    return True, cached.get("data")
+
+
+def _store_disk_cached_config(file_path: str, digest: str, config_data: Optional[Dict[str, Any]]) -> None:
+    """パース結果をディスクキャッシュに保存（一時ファイル経由で置き換え、失敗しても読み込みは継続）"""
+    if not _CONFIG_CACHE_DIR:
+        return
+    try:
+        payload = _json_dumps({"key": [_CONFIG_CACHE_VERSION, file_path, digest], "data": config_data})
+        # 日付や非文字列キーなどJSONで同じ値に戻らない設定は、型が変わるため保存しない
+        if _json_loads(payload)["data"] != config_data:
+            return
+        os.makedirs(_CONFIG_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_CONFIG_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, _config_cache_file(file_path))
+    except Exception as e:
+        logger.debug("Failed to write config cache", file=os.path.basename(file_path), error=str(e))
+
+
+@lru_cache(maxsize=64)
+def _scan_yaml_files(config_dir: str, dir_mtime_ns: int) -> tuple:
+    """
+    ディレクトリ内のYAMLファイルパスをソート済みで取得
+
+    ファイルの追加・削除・名前変更でディレクトリのmtimeが変わるため、mtimeをキーに結果を再利用する
+    （mtimeの粒度より短い間隔の変更は検出できないため、直近に変更されたディレクトリでは使わない）
+    """
+    with os.scandir(config_dir) as entries:
+        return tuple(sorted(
+            entry.path for entry in entries
+            if entry.name.endswith(".yaml") and entry.is_file()
+        ))
+
+
+# ディレクトリのmtimeがこの時間内なら一覧のキャッシュを使わない（秒単位など粒度の粗いファイルシステムで、
+# 前回の走査と同じ時刻内に追加されたファイルを見落とさないため）
+_RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+
+def _list_yaml_files(config_dir: str) -> tuple:
+    """ディレクトリ内のYAMLファイルパスを取得（直近に変更されたディレクトリは常に走査し直す）"""
+    dir_mtime_ns = os.stat(config_dir).st_mtime_ns
+    if time.time_ns() - dir_mtime_ns < _RACY_MTIME_WINDOW_NS:
+        return _scan_yaml_files.__wrapped__(config_dir, dir_mtime_ns)
+    return _scan_yaml_files(config_dir, dir_mtime_ns)
+
+
+# ディレクトリ内のファイル数がこれを超える場合のみスレッドプールでパース（少数ならプール生成の方が高コスト）
+_PARALLEL_PARSE_THRESHOLD = 8
+
+
+# Crewに設定する基本メモリ設定（読み取り専用。Crewには浅いコピーを渡す）
+_BASIC_MEMORY_CONFIG = MappingProxyType({"provider": "basic", "config": {}, "user_memory": {}})
+
+
+# Evolution関連はevolution_crew構築時のみ必要なため初回使用時にインポート（一覧取得などの起動を軽くする）
+@lru_cache(maxsize=1)
+def _evolution_changes_model() -> type:
+    """Evolution Crew出力用のPydanticモデルを取得"""
+    from models.evolution_output import EvolutionChanges
+    return EvolutionChanges
+
+
+@lru_cache(maxsize=1)
+def _mem0_memory_classes() -> tuple:
+    """mem0外部メモリ用のクラス (ExternalMemory, Mem0V2Storage) を取得（mem0使用時のみインポート）"""
+    from crewai.memory.external.external_memory import ExternalMemory
+    from core.mem0_v2_storage import Mem0V2Storage
+    return ExternalMemory, Mem0V2Storage
+
+
+@lru_cache(maxsize=1)
+def _crew_memory_classes() -> tuple:
+    """クルー用のメモリクラス (ShortTermMemory, EntityMemory) を取得（初回のみインポート）"""
+    from crewai.memory.short_term.short_term_memory import ShortTermMemory
+    from crewai.memory.entity.entity_memory import EntityMemory
+    return ShortTermMemory, EntityMemory
+
+
+# output_jsonで指定できるモデル名 -> モデル取得関数（モデルの追加はここに1行登録する）
+_OUTPUT_MODEL_REGISTRY = MappingProxyType({
+    "EvolutionChanges": _evolution_changes_model,
+})
+
+
+@lru_cache(maxsize=1)
+def _evolution_callbacks() -> tuple:
+    """Evolution Crew用のコールバック関数 (crew_callback, task_callback) を取得"""
+    from evolution.evolution_callback import evolution_crew_callback, evolution_task_callback
+    return evolution_crew_callback, evolution_task_callback
+
+
+# MCP/Dockerツールはプロセス内で同一のため、初回生成分を全ファクトリー・エージェント・タスクで共有
+@lru_cache(maxsize=1)
+def _cached_mcp_tools() -> tuple:
+    """MCPツールを取得（初回のみ生成）"""
+    return tuple(get_mcp_tools_for_agent())
+
+
+@lru_cache(maxsize=1)
+def _cached_docker_tool_map() -> MappingProxyType:
+    """ツール名からDockerツールへの読み取り専用マップを取得（初回のみ生成）"""
+    # 位置ではなく各ツール自身のnameをキーにする（get_docker_toolsの並び順に依存しない）
+    return MappingProxyType({tool.name: tool for tool in get_docker_tools()})
+
+
+# ツール名 -> 追加するツールのタプルを返す関数（ツール本体は初回使用時に生成）
+# Dockerツールは各ツールのnameで_cached_docker_tool_mapから解決する
+_TOOL_RESOLVERS = MappingProxyType({
+    "mcp": _cached_mcp_tools,
+    "knowledge_search": lambda: (search_knowledge,),
+    "add_knowledge": lambda: (add_knowledge_to_base,),
+})
+
 
 class CrewFactory:
     """クルーの作成と管理を行うファクトリー"""
 
+    # パース済みYAMLのキャッシュ（ファイルパス -> ((mtime, サイズ), 内容)）とディレクトリごとのマージ結果
+    # テストやワーカーで複数インスタンスを生成しても再パースしないよう全インスタンスで共有する
+    _YAML_CACHE: Dict[str, tuple] = {}
+    _MERGED_CONFIGS: Dict[str, tuple] = {}
+
     def __init__(self, config_dir: str = "config"):
         """
         クルーファクトリーの初期化
@@ -41,17 +252,30 @@ class CrewFactory:
         self.config_dir = Path(config_dir)
         self.config = get_config()
         self.active_crews: Dict[str, Crew] = {}
+        # get_active_crews用の読み取り専用ビュー（呼び出しごとのコピーを避ける）
+        self._active_crews_view = MappingProxyType(self.active_crews)
+        # アクティブなクルーの生成元設定（クルー名 -> クルー・エージェント・タスク設定のタプル）
+        self._crew_signatures: Dict[str, tuple] = {}
+        # エージェント生成用の引数（エージェント名 -> (生成元の設定, ツール・LLM・知識ソース解決済みの引数)）
+        # Agentはクルーや実行器などの実行時状態を持つため、インスタンスではなく引数を再利用する
+        self._agent_kwargs_cache: Dict[str, tuple] = {}
+        # ツール解決・デフォルト値適用済みのエージェント設定（エージェント名 -> (元の設定, 準備済み設定)）
+        self._prepared_agent_configs: Dict[str, tuple] = {}
+        # list_*用の設定名タプル（種別 -> (設定辞書, 名前のタプル)）。設定辞書が差し替わると作り直す
+        self._config_names: Dict[str, tuple] = {}
+        # 直前にreload_configsを実行した時刻（time.monotonic）
+        self._last_reload = float("-inf")
         
-        # Monica LLMの初期化（既定のまま保持）
-        self.monica_llm = LLM(
-            model="gpt-4o",
-            api_key=os.environ.get("MONICA_API_KEY"),
-            base_url="https://openapi.monica.im/v1"
-        )
+        # Monica LLMは初回アクセス時に生成（一覧取得のみの用途ではクライアントを作らない）
+        self._monica_llm: Optional[LLM] = None
+        self._agent_llms: Dict[str, LLM] = {}
+        
+        # クルー生成で参照する環境変数・埋め込み設定は一度だけ解決（reload_envで再取得）
+        self.reload_env()
         
-        # 設定の読み込み
-        self.agent_configs = self._load_configs("agents")
-        self.task_configs = self._load_configs("tasks")
+        # 設定の読み込み（クルー設定のみ即時。エージェント・タスク設定は初回参照時に読み込む）
+        self._agent_configs: Optional[Dict[str, Any]] = None
+        self._task_configs: Optional[Dict[str, Any]] = None
         self.crew_configs = self._load_configs("crews")
         
         # 共有KnowledgeManagerインスタンス（自動初期化）
@@ -61,20 +285,96 @@ class CrewFactory:
         # MemoryManagerの初期化（グラフメモリ対応、シンプル版）
         self.memory_manager = MemoryManager(use_graph_memory=True)
         
-        # KnowledgeGraphIntegrationの初期化
-        if self.memory_manager.kg_integration:
-            # KnowledgeManagerを統合層に設定
-            self.memory_manager.kg_integration.knowledge_manager = self._knowledge_manager
+        # KnowledgeManagerを統合層に設定（KnowledgeGraphIntegrationは初回アクセス時に生成）
+        self.memory_manager.knowledge_manager = self._knowledge_manager
         
         logger.info(
             "Crew Factory initialized",
-            agents=len(self.agent_configs),
-            tasks=len(self.task_configs),
-            crews=len(self.crew_configs)
+            crews=len(self.crew_configs),
+            yaml_loader=_YamlLoader.__name__
         )
 
+    @property
+    def agent_configs(self) -> Dict[str, Any]:
+        """エージェント設定（初回アクセス時にconfig/agentsを読み込む）"""
+        if self._agent_configs is None:
+            self._agent_configs = self._load_configs("agents")
+        return self._agent_configs
+
+    @agent_configs.setter
+    def agent_configs(self, value: Dict[str, Any]) -> None:
+        self._agent_configs = value
+
+    @property
+    def task_configs(self) -> Dict[str, Any]:
+        """タスク設定（初回アクセス時にconfig/tasksを読み込む）"""
+        if self._task_configs is None:
+            self._task_configs = self._load_configs("tasks")
+        return self._task_configs
+
+    @task_configs.setter
+    def task_configs(self, value: Dict[str, Any]) -> None:
+        self._task_configs = value
+
+    @property
+    def monica_llm(self) -> LLM:
+        """Monica LLM（マネージャー・プランニング用、初回アクセス時に生成）"""
+        if self._monica_llm is None:
+            self._monica_llm = self._create_monica_llm()
+        return self._monica_llm
+
+    def _llm_for(self, agent_name: str) -> LLM:
+        """
+        エージェント専用のMonica LLMを取得（エージェント名ごとに一度だけ生成）
+
+        全エージェントで1つのLLMインスタンスを共有すると、リクエスト単位の状態
+        （コールバック・使用量カウンタ等）を並列実行中のクルー間で取り合うため分離する。
+        """
+        llm = self._agent_llms.get(agent_name)
+        if llm is None:
+            llm = self._agent_llms[agent_name] = self._create_monica_llm()
+        return llm
+
+    def reload_env(self) -> None:
+        """クルー生成で参照する環境変数と埋め込み設定を再取得（テストや設定変更後に使用）"""
+        self._env = SimpleNamespace(
+            use_mem0=os.getenv("USE_MEM0", "false").lower() == "true",
+            mem0_api_key=os.getenv("MEM0_API_KEY"),
+            mem0_user_id=os.getenv("MEM0_USER_ID", "okami_system"),
+            mem0_api_base=os.getenv("MEM0_API_BASE", "https://api.mem0.ai"),
+            # 開発用: get_crewのたびに設定ファイルのmtime・サイズを確認し、変更があれば再構築
+            config_auto_reload=os.getenv("OKAMI_CONFIG_AUTO_RELOAD", "false").lower() == "true",
+        )
+        # YAMLでURL未指定のOllama embedder用URLもここで解決
+        self._embedder_config = self.config.get_embedder_config()
+        self._ollama_embeddings_url = self._resolve_ollama_embeddings_url()
+
+    @staticmethod
+    def _resolve_ollama_embeddings_url() -> str:
+        """OLLAMA_BASE_URLからembeddings APIのURLを組み立てる（コンテナ内ではlocalhostを補正）"""
+        base = os.getenv("OLLAMA_BASE_URL", "http://host.docker.internal:11434").rstrip("/")
+        # コンテナ内から localhost を叩かないよう補正
+        in_docker = os.path.exists("/.dockerenv") or os.getenv("IN_DOCKER") == "1"
+        if in_docker and ("localhost" in base or "127.0.0.1" in base):
+            base = base.replace("localhost", "host.docker.internal").replace("127.0.0.1", "host.docker.internal")
+        return f"{base}/api/embeddings"
+
+    @staticmethod
+    def _create_monica_llm() -> LLM:
+        """Monica LLMを生成（既定のまま保持）"""
+        return LLM(
+            model="gpt-4o",
+            api_key=os.environ.get("MONICA_API_KEY"),
+            base_url="https://openapi.monica.im/v1"
+        )
+
+    def _load_all_configs(self) -> tuple:
+        """agents/tasks/crewsの3ディレクトリを並列に読み込む"""
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            return tuple(executor.map(self._load_configs, ("agents", "tasks", "crews")))
+
     def _load_configs(self, config_type: str) -> Dict[str, Any]:
-        """設定ファイルの読み込み"""
+        """設定ファイルの読み込み（mtime・サイズが変わっていないファイルは再パースしない）"""
         configs = {}
         config_path = self.config_dir / config_type
         
@@ -82,47 +382,120 @@ class CrewFactory:
             logger.warning(f"Config directory not found", path=str(config_path))
             return configs
         
-        for file_path in config_path.glob("*.yaml"):
+        # ファイル一覧はディレクトリのmtimeが変わった場合のみ走査し直す（内容の変更は各ファイルのstatで検出）
+        config_dir = os.path.abspath(config_path)
+        file_stamps = []
+        for file_path in _list_yaml_files(config_dir):
             try:
-                with open(file_path, "r") as f:
-                    content = f.read()
-                    # 非推奨ファイルをスキップ
-                    if "deprecated" in content.lower() or content.strip().startswith("#"):
-                        logger.debug(f"Skipping deprecated config", file=file_path.name)
-                        continue
-                    
-                    config_data = yaml.safe_load(content)
-                    if config_data:
-                        configs.update(config_data)
-                        logger.debug(f"Loaded config", file=file_path.name, items=len(config_data))
-            except Exception as e:
-                logger.error(f"Failed to load config", file=file_path.name, error=str(e))
+                stat = os.stat(file_path)
+                file_stamps.append((file_path, (stat.st_mtime_ns, stat.st_size)))
+            except OSError as e:
+                logger.error(f"Failed to load config", file=os.path.basename(file_path), error=str(e))
+        
+        # 全ファイルが前回と同一ならマージ済みの結果を再利用
+        signature = tuple(file_stamps)
+        merged = self._MERGED_CONFIGS.get(config_dir)
+        if merged is not None and merged[0] == signature:
+            return dict(merged[1])
+        
+        # 変更のあったファイルのみ読み込み・パース（件数が多い場合のみ並列化）
+        stale = [
+            (file_path, stamp) for file_path, stamp in file_stamps
+            if self._YAML_CACHE.get(file_path, (None,))[0] != stamp
+        ]
+        if len(stale) > _PARALLEL_PARSE_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=min(8, len(stale))) as executor:
+                parsed = list(executor.map(self._load_config_file, [file_path for file_path, _ in stale]))
+        else:
+            parsed = [self._load_config_file(file_path) for file_path, _ in stale]
+        for (file_path, stamp), config_data in zip(stale, parsed):
+            self._YAML_CACHE[file_path] = (stamp, config_data)
         
-        return configs
+        # マージはファイル名順で行い、結果を決定的にする
+        for file_path, _ in file_stamps:
+            config_data = self._YAML_CACHE[file_path][1]
+            if config_data:
+                configs.update(config_data)
+        
+        self._MERGED_CONFIGS[config_dir] = (signature, configs)
+        return dict(configs)
+    
+    def _load_config_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """設定ファイル1件を取得（ディスクキャッシュが(パス, 内容のハッシュ)で一致すればパースしない）"""
+        if not _CONFIG_CACHE_DIR:
+            return self._parse_config_file(file_path)
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.error(f"Failed to load config", file=os.path.basename(file_path), error=str(e))
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        hit, config_data = _load_disk_cached_config(file_path, digest)
+        if hit:
+            return config_data
+        config_data = self._parse_config_file(file_path, data)
+        _store_disk_cached_config(file_path, digest, config_data)
+        return config_data
+
+    def _parse_config_file(self, file_path: str, data: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """YAMLファイル1件をパース（読み込み済みの内容があればそれを使用。非推奨ファイル・読み込み失敗時はNone）"""
+        file_name = os.path.basename(file_path)
+        try:
+            if data is not None:
+                if _DEPRECATED_MARKER.search(data[:512]):
+                    logger.debug(f"Skipping deprecated config", file=file_name)
+                    return None
+                config_data = yaml.load(data, Loader=_YamlLoader)
+            else:
+                # バイナリのファイルハンドルを直接ローダーに渡し、全文の中間バッファを作らない
+                with open(file_path, "rb") as f:
+                    # 非推奨ファイルをスキップ（マーカーは先頭部分のみ確認し、全文のlower()を避ける）
+                    # コメントのみのファイルはパース結果がNoneになるため、先頭の"#"だけでは除外しない
+                    if _DEPRECATED_MARKER.search(f.read(512)):
+                        logger.debug(f"Skipping deprecated config", file=file_name)
+                        return None
+                    f.seek(0)
+                    config_data = yaml.load(f, Loader=_YamlLoader)
+            
+            if config_data:
+                logger.debug(f"Loaded config", file=file_name, items=len(config_data))
+            return config_data
+        except Exception as e:
+            logger.error(f"Failed to load config", file=file_name, error=str(e))
+            return None
     
     def _initialize_knowledge_manager(self):
-        """KnowledgeManagerの初期化と自動セットアップ"""
+        """
+        KnowledgeManagerの初期化と自動セットアップ
+
+        KnowledgeManagerはクルー・エージェントの知識ソースを保持するため、ファクトリーごとに1つだけ生成し、
+        このファクトリーのエージェント・クルーはすべてこのインスタンスを使う（他のファクトリーとは共有しない）。
+        フォールバックの生成にも失敗した場合は例外を送出する（以降は常に非Noneを前提とする）
+        """
+        embedder_config = self._embedder_config
         try:
+            self._knowledge_manager = KnowledgeManager(
+                knowledge_dir=self.config.knowledge_dir,
+                embedder_config=embedder_config
+            )
+            
+            # 知識の自動初期化
+            success = self._knowledge_manager.auto_initialize_knowledge()
+            if success:
+                logger.info("Knowledge manager auto-initialized successfully")
+            else:
+                logger.warning("Knowledge manager auto-initialization had issues")
+                
+        except Exception as e:
+            logger.error(f"Failed to initialize knowledge manager: {e}")
+            # 生成済みで自動初期化のみ失敗した場合はそのまま使用
             if self._knowledge_manager is None:
+                # フォールバック：基本的なKnowledgeManagerを作成
                 self._knowledge_manager = KnowledgeManager(
                     knowledge_dir=self.config.knowledge_dir,
-                    embedder_config=self.config.get_embedder_config()
+                    embedder_config=embedder_config
                 )
-                
-                # 知識の自動初期化
-                success = self._knowledge_manager.auto_initialize_knowledge()
-                if success:
-                    logger.info("Knowledge manager auto-initialized successfully")
-                else:
-                    logger.warning("Knowledge manager auto-initialization had issues")
-                    
-        except Exception as e:
-            logger.error(f"Failed to initialize knowledge manager: {e}")
-            # フォールバック：基本的なKnowledgeManagerを作成
-            self._knowledge_manager = KnowledgeManager(
-                knowledge_dir=self.config.knowledge_dir,
-                embedder_config=self.config.get_embedder_config()
-            )
     
     def refresh_knowledge(self, force_reload: bool = False) -> Dict[str, Any]:
         """
@@ -134,11 +507,60 @@ class CrewFactory:
         Returns:
             更新結果の統計
         """
-        if self._knowledge_manager is None:
-            self._initialize_knowledge_manager()
-        
+        if force_reload:
+            # 知識ソースはエージェント生成時に渡されるため、強制再読み込み後は作り直す
+            self._agent_kwargs_cache.clear()
         return self._knowledge_manager.refresh_knowledge_from_directory(force_reload)
 
+    def _resolve_tools(self, tools_config: List[Any]) -> List[Any]:
+        """設定のツール名リストをツールインスタンスに解決（設定順に1回だけ走査）"""
+        tools = []
+        seen = set()
+        for tool_name in tools_config:
+            if not isinstance(tool_name, str) or tool_name in seen:
+                continue
+            seen.add(tool_name)
+            
+            # 名前は完全一致で解決（部分一致だと"mcp"を含む別名のツールまで誤って反応する）
+            resolver = _TOOL_RESOLVERS.get(tool_name)
+            if resolver is not None:
+                tools.extend(resolver())
+            elif tool_name.startswith("docker"):
+                docker_tool = _cached_docker_tool_map().get(tool_name)
+                if docker_tool is not None:
+                    tools.append(docker_tool)
+                elif tool_name != "docker":
+                    logger.warning(f"Unknown tool type", tool_name=tool_name)
+            else:
+                # その他のツール名（将来的に拡張可能）
+                logger.warning(f"Unknown tool type", tool_name=tool_name)
+        
+        return tools
+
+    def _get_prepared_agent_config(self, agent_name: str) -> Dict[str, Any]:
+        """
+        ツール解決とデフォルト値の適用を済ませたエージェント設定を取得
+
+        設定名ごとに一度だけ組み立て、元の設定が再読み込みで変わった場合のみ作り直す。
+        戻り値は共有されるため、呼び出し側はコピーして使用すること。
+        """
+        agent_config = self.agent_configs[agent_name]
+        cached = self._prepared_agent_configs.get(agent_name)
+        if cached is not None and cached[0] is agent_config:
+            return cached[1]
+        
+        prepared = agent_config.copy()
+        # 指定されている場合、エージェントのツールを取得
+        prepared["tools"] = self._resolve_tools(agent_config["tools"]) if agent_config.get("tools") else []
+        # 指定されていない場合、デフォルト値を設定
+        prepared.setdefault("verbose", True)
+        prepared.setdefault("memory", True)
+        prepared.setdefault("max_iter", self.config.default_max_iter)
+        prepared.setdefault("allow_delegation", True)
+        
+        self._prepared_agent_configs[agent_name] = (agent_config, prepared)
+        return prepared
+
     def create_agent(self, agent_name: str) -> Optional[Agent]:
         """
         設定からエージェントを作成
@@ -153,78 +575,46 @@ class CrewFactory:
             logger.error(f"Agent config not found", agent_name=agent_name)
             return None
         
-        config = self.agent_configs[agent_name].copy()
+        # 同じ設定から組み立て済みの引数があれば再利用（設定が再読み込みで変われば作り直す）
+        # エージェント自体は呼び出しごとに生成し、クルー間で共有しない
+        agent_config = self.agent_configs[agent_name]
+        cached = self._agent_kwargs_cache.get(agent_name)
+        if cached is not None and cached[0] is agent_config:
+            try:
+                return Agent(**{**cached[1], "tools": list(cached[1]["tools"])})
+            except Exception as e:
+                logger.error(f"Failed to create agent", agent_name=agent_name, error=str(e))
+                return None
         
         try:
-            # 指定されている場合、エージェントのツールを取得
-            agent_tools = []
-            if config.get("tools"):
-                tools_config = config.get("tools", [])
-                
-                # MCPツールのチェック
-                if any("mcp" in str(tool).lower() for tool in tools_config):
-                    agent_tools.extend(get_mcp_tools_for_agent())
-                
-                # Dockerツールのチェック
-                if any("docker" in str(tool).lower() for tool in tools_config):
-                    # 特定のDockerツールを取得
-                    docker_tools = get_docker_tools()
-                    docker_tool_map = {
-                        "docker_list_containers": docker_tools[0],
-                        "docker_container_logs": docker_tools[1],
-                        "docker_exec": docker_tools[2],
-                        "docker_manage_container": docker_tools[3]
-                    }
-                    # リクエストされたDockerツールのみ追加
-                    for tool_name in tools_config:
-                        if tool_name in docker_tool_map:
-                            agent_tools.append(docker_tool_map[tool_name])
-                
-                # 知識検索ツールのチェック
-                if "knowledge_search" in tools_config:
-                    agent_tools.append(search_knowledge)
-                if "add_knowledge" in tools_config:
-                    agent_tools.append(add_knowledge_to_base)
-                
-                # その他のツール名をチェック（将来的に拡張可能）
-                for tool_name in tools_config:
-                    if isinstance(tool_name, str) and tool_name not in ["mcp", "docker", "knowledge_search", "add_knowledge"]:
-                        logger.warning(f"Unknown tool type", tool_name=tool_name)
+            # 実行時状態に依存しない部分（ツール解決・デフォルト値）は準備済み設定から取得
+            config = self._get_prepared_agent_config(agent_name).copy()
+            agent_tools = list(config["tools"])
             
             # エージェント用の知識ソースを設定（CrewAI標準機能）
             agent_knowledge_sources = []
             if config.get("knowledge_sources"):
-                # 共有KnowledgeManagerインスタンスを使用
-                if self._knowledge_manager is None:
-                    self._knowledge_manager = KnowledgeManager(
-                        knowledge_dir=self.config.knowledge_dir,
-                        embedder_config=self.config.get_embedder_config()
-                    )
-                
-                for source in config["knowledge_sources"]:
-                    self._knowledge_manager.add_agent_knowledge(agent_name, source)
+                # 共有KnowledgeManagerインスタンスを使用（__init__で必ず生成済み）
+                assert self._knowledge_manager is not None
+                self._knowledge_manager.add_agent_knowledge_batch(agent_name, config["knowledge_sources"])
                 
                 agent_knowledge_sources = self._knowledge_manager.get_agent_knowledge_config(agent_name)
             
             # Update config with processed values
             config["tools"] = agent_tools
-            config["llm"] = self.monica_llm
+            config["llm"] = self._llm_for(agent_name)
             
             # エージェント用の知識ソースを追加
             if agent_knowledge_sources:
                 config.update(agent_knowledge_sources)
             
-            # 指定されていない場合、デフォルト値を設定
-            config.setdefault("verbose", True)
-            config.setdefault("memory", True)
-            config.setdefault("max_iter", self.config.default_max_iter)
-            config.setdefault("allow_delegation", True)
-            
             # すべての設定パラメータでエージェントを作成
-            logger.info("Agent config used", agent_name=agent_name, config=truncate_dict(config))
-            agent = Agent(**config)
+            if _debug_logging_enabled():
+                logger.debug("Agent config used", agent_name=agent_name, config=truncate_dict(config))
+            agent = Agent(**{**config, "tools": list(agent_tools)})
             
             logger.info(f"Agent created", role=agent.role, tools=len(agent_tools))
+            self._agent_kwargs_cache[agent_name] = (agent_config, config)
             return agent
             
         except Exception as e:
@@ -250,69 +640,37 @@ class CrewFactory:
             logger.error(f"Invalid task config format", task_name=task_name, config_type=type(task_config))
             return None
         
-        config = task_config.copy()
-        
         try:
-            # コンテキストの処理 - 後で解決するために保存
-            context_names = None
-            if "context" in config and isinstance(config["context"], list):
-                context_names = config.pop("context")
+            # 後で解決する値（コンテキスト名・エージェント名）と未対応の文字列guardrailを除き、
+            # 残りのキーでタスク引数を1回で組み立てる（コピー後のpop/再代入を避ける）
+            deferred = set()
+            context_names = task_config.get("context")
+            if isinstance(context_names, list):
+                deferred.add("context")
+            else:
+                context_names = None
+            agent_name = task_config.get("agent")
+            if isinstance(agent_name, str):
+                deferred.add("agent")
+            else:
+                agent_name = None
+            if isinstance(task_config.get("guardrail"), str):
+                deferred.add("guardrail")
+            config = {key: value for key, value in task_config.items() if key not in deferred}
             
             # Toolsの処理
-            task_tools = []
-            if config.get("tools"):
-                tools_config = config.get("tools", [])
-                
-                # MCPツールのチェック
-                if any("mcp" in str(tool).lower() for tool in tools_config):
-                    task_tools.extend(get_mcp_tools_for_agent())
-                
-                # Dockerツールのチェック
-                if any("docker" in str(tool).lower() for tool in tools_config):
-                    # 特定のDockerツールを取得
-                    docker_tools = get_docker_tools()
-                    docker_tool_map = {
-                        "docker_list_containers": docker_tools[0],
-                        "docker_container_logs": docker_tools[1],
-                        "docker_exec": docker_tools[2],
-                        "docker_manage_container": docker_tools[3]
-                    }
-                    # リクエストされたDockerツールのみ追加
-                    for tool_name in tools_config:
-                        if tool_name in docker_tool_map:
-                            task_tools.append(docker_tool_map[tool_name])
-                
-                # 知識検索ツールのチェック
-                if "knowledge_search" in tools_config:
-                    task_tools.append(search_knowledge)
-                if "add_knowledge" in tools_config:
-                    task_tools.append(add_knowledge_to_base)
-                
-                # その他のツール名をチェック（将来的に拡張可能）
-                for tool_name in tools_config:
-                    if isinstance(tool_name, str) and tool_name not in ["mcp", "docker", "knowledge_search", "add_knowledge"]:
-                        logger.warning(f"Unknown tool type", tool_name=tool_name)
-            
-            # 処理されたツールを設定
+            task_tools = self._resolve_tools(task_config["tools"]) if task_config.get("tools") else []
             config["tools"] = task_tools
             
-            # guardrailが文字列の場合は削除（後で処理）
-            guardrail_name = None
-            if "guardrail" in config and isinstance(config["guardrail"], str):
-                guardrail_name = config.pop("guardrail")
-            
-            # agentが文字列の場合は後で解決するために保存
-            agent_name = None
-            if "agent" in config and isinstance(config["agent"], str):
-                agent_name = config.pop("agent")
-            
             # output_jsonが文字列の場合、対応するPydanticモデルに変換
             if "output_json" in config and isinstance(config["output_json"], str):
-                if config["output_json"] == "EvolutionChanges":
-                    config["output_json"] = EvolutionChanges
+                model_loader = _OUTPUT_MODEL_REGISTRY.get(config["output_json"])
+                if model_loader is not None:
+                    config["output_json"] = model_loader()
             
             # すべての設定パラメータでタスクを作成
-            logger.info("Task config used", task_name=task_name, config=truncate_dict(config))
+            if _debug_logging_enabled():
+                logger.debug("Task config used", task_name=task_name, config=truncate_dict(config))
             task = Task(**config)
             
             # 一時的にエージェント名を保存
@@ -344,15 +702,13 @@ class CrewFactory:
             logger.error(f"Crew config not found", crew_name=crew_name)
             return None
         
-        config = self.crew_configs[crew_name]
+        # 読み込んだ設定はキャッシュと共有されるため、コピーに対して組み立てる
+        config = self.crew_configs[crew_name].copy()
         
         try:
             # エージェントの作成
-            agents = []
-            for agent_name in config.get("agents", []):
-                agent = self.create_agent(agent_name)
-                if agent:
-                    agents.append(agent)
+            # エージェント名から実際のエージェントオブジェクトへのマッピング（タスクのエージェント解決に使用）
+            agents, agent_map = self._build_crew_agents(config.get("agents", []))
             
             # まずプロセスタイプを決定
             process_str = config.get("process", "sequential")
@@ -373,15 +729,14 @@ class CrewFactory:
                     tasks.append(task)
                     task_map[task_name] = task
             
-            # エージェント名から実際のエージェントオブジェクトへのマッピングを作成
-            agent_map = {agent.role: agent for agent in agents}
-            
             # タスクのエージェント解決（sequentialプロセスのみ）
+            # クルーのエージェントを優先し、含まれない場合のみ新たに生成する（クルー内では同じインスタンスを使う）
             if process == Process.sequential:
                 for task in tasks:
                     if hasattr(task, '_agent_name'):
-                        agent = self.create_agent(task._agent_name)
+                        agent = agent_map.get(task._agent_name) or self.create_agent(task._agent_name)
                         if agent:
+                            agent_map[task._agent_name] = agent
                             task.agent = agent
                         else:
                             logger.error(f"Agent not found for task", agent_name=task._agent_name)
@@ -414,7 +769,7 @@ class CrewFactory:
                 if config.get("manager_agent"):
                     manager_agent_name = config.get("manager_agent")
                     # マネージャーエージェントを作成（まだエージェントリストに含まれていない場合）
-                    manager_agent = self.create_agent(manager_agent_name)
+                    manager_agent = agent_map.get(manager_agent_name) or self.create_agent(manager_agent_name)
                     # CrewAIのバリデーションに従い、agents には含めず、
                     # 生成後にテスト互換性のため追加する
                     if manager_agent and manager_agent in agents:
@@ -424,32 +779,12 @@ class CrewFactory:
                     if "manager_agent" in config:
                         config.pop("manager_agent", None)
             
-            # エンベッダー設定の取得（ollamaを使用）
-            # 環境変数からOllamaのURLを取得
-            ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-            embedder_model = os.getenv("EMBEDDER_MODEL", "mxbai-embed-large")
-            
-            embedder_config = {
-                "provider": "ollama",  # ollamaを使用
-                "config": {
-                    "model": embedder_model,
-                    # CrewAI 側は base_url を想定
-                    "base_url": ollama_base_url
-                }
-            }
-            
             # Knowledge sourcesの処理（Qdrantを使わないため簡素化、バックアップ版の復元）
             knowledge_sources = []
             if config.get("knowledge_sources"):
-                # 共有KnowledgeManagerインスタンスを使用
-                if self._knowledge_manager is None:
-                    self._knowledge_manager = KnowledgeManager(
-                        knowledge_dir=self.config.knowledge_dir,
-                        embedder_config=embedder_config
-                    )
-                
-                for source in config["knowledge_sources"]:
-                    self._knowledge_manager.add_crew_knowledge(source)
+                # 共有KnowledgeManagerインスタンスを使用（__init__で必ず生成済み）
+                assert self._knowledge_manager is not None
+                self._knowledge_manager.add_crew_knowledge_batch(config["knowledge_sources"])
                 
                 # KnowledgeManagerからBaseKnowledgeSourceインスタンスを取得
                 knowledge_sources = self._knowledge_manager.crew_sources
@@ -479,16 +814,15 @@ class CrewFactory:
             mem0_config = config.get("mem0_config", {})
             
             # env優先: USE_MEM0=true かつ MEM0_API_KEY があれば、YAMLが無くてもmem0を有効化
-            use_mem0_env = os.getenv("USE_MEM0", "false").lower() == "true"
-            mem0_api_key = os.getenv("MEM0_API_KEY")
+            use_mem0_env = self._env.use_mem0
+            mem0_api_key = self._env.mem0_api_key
             if (mem0_config or use_mem0_env) and mem0_api_key:
                 try:
                     # user_id はYAML優先、なければ環境変数 MEM0_USER_ID、最後に既定
-                    mem0_user_id = mem0_config.get("user_id") or os.getenv("MEM0_USER_ID", "okami_system")
+                    mem0_user_id = mem0_config.get("user_id") or self._env.mem0_user_id
                     
                     # ExternalMemoryを使用する設定（Mem0 v2 ストレージ差し替え）
-                    from crewai.memory.external.external_memory import ExternalMemory
-                    from core.mem0_v2_storage import Mem0V2Storage
+                    ExternalMemory, Mem0V2Storage = _mem0_memory_classes()
 
                     storage = Mem0V2Storage(
                         user_id=mem0_user_id,
@@ -499,7 +833,7 @@ class CrewFactory:
                         excludes=mem0_config.get("excludes"),
                         infer=mem0_config.get("infer", True),
                         api_key=mem0_api_key,
-                        api_base=os.getenv("MEM0_API_BASE", "https://api.mem0.ai"),
+                        api_base=self._env.mem0_api_base,
                     )
                     external_memory = ExternalMemory(storage=storage)
                     
@@ -517,12 +851,8 @@ class CrewFactory:
                     logger.error(f"Failed to configure mem0 external memory: {e}")
                     # フォールバック: 基本メモリ設定
                     config["memory"] = True
-                    config["memory_config"] = {
-                        "provider": "basic",
-                        "config": {},
-                        "user_memory": {}
-                    }
-            elif mem0_config and not os.getenv("MEM0_API_KEY"):
+                    config["memory_config"] = dict(_BASIC_MEMORY_CONFIG)
+            elif mem0_config and not mem0_api_key:
                 # mem0_configが設定されているがAPIキーがない場合
                 logger.warning("Mem0 configured but MEM0_API_KEY not found, using basic memory only")
                 # mem0_configを削除
@@ -533,11 +863,7 @@ class CrewFactory:
             if not memory_config or memory_config.get("provider") != "basic":
                 # デフォルトのbasic memoryを設定
                 config["memory"] = True
-                config["memory_config"] = {
-                    "provider": "basic",
-                    "config": {},
-                    "user_memory": {}
-                }
+                config["memory_config"] = dict(_BASIC_MEMORY_CONFIG)
             
             # グラフメモリの設定（crew_configから読み取るか、デフォルトで有効）
             use_graph_memory = config.get("graph_memory", True)
@@ -568,7 +894,8 @@ class CrewFactory:
             provided_embedder = config.get("embedder")
             if not provided_embedder:
                 try:
-                    cfg_embedder = self.config.get_embedder_config()
+                    # クルーごとに変更されても共有の設定に影響しないようコピーを渡す
+                    cfg_embedder = {**self._embedder_config, "config": dict(self._embedder_config.get("config") or {})}
                     # CrewAI は embedder に {provider, config} を期待
                     config["embedder"] = cfg_embedder
                     logger.info(
@@ -585,18 +912,11 @@ class CrewFactory:
                 # 既存の YAML embedder（ollama）の URL を Docker 内向けに正規化
                 try:
                     if isinstance(provided_embedder, dict) and provided_embedder.get("provider") == "ollama":
-                        cfg = provided_embedder.setdefault("config", {})
+                        # 読み込んだYAML設定はキャッシュと共有されるため、コピーに対して補正する
+                        cfg = dict(provided_embedder.get("config") or {})
                         # YAMLにurlが明示されていればそれを優先し、無い場合のみ組み立てる
                         if not cfg.get("url"):
-                            base = os.getenv("OLLAMA_BASE_URL", "http://host.docker.internal:11434").rstrip("/")
-                            # コンテナ内から localhost を叩かないよう補正
-                            try:
-                                in_docker = os.path.exists("/.dockerenv") or os.getenv("IN_DOCKER") == "1"
-                                if in_docker and ("localhost" in base or "127.0.0.1" in base):
-                                    base = base.replace("localhost", "host.docker.internal").replace("127.0.0.1", "host.docker.internal")
-                            except Exception:
-                                pass
-                            cfg["url"] = f"{base}/api/embeddings"
+                            cfg["url"] = self._ollama_embeddings_url
                             logger.info("Normalized Ollama embedder url", url=cfg.get("url"))
                         else:
                             logger.info("Using provided Ollama embedder url", url=cfg.get("url"))
@@ -606,12 +926,11 @@ class CrewFactory:
             # memory=True の場合は Short/Entity メモリに embedder_config を明示
             if config.get("memory"):
                 try:
-                    from crewai.memory.short_term.short_term_memory import ShortTermMemory
-                    from crewai.memory.entity.entity_memory import EntityMemory
+                    ShortTermMemory, EntityMemory = _crew_memory_classes()
                     if "embedder" in config:
                         embedder_cfg = config["embedder"]
                     else:
-                        embedder_cfg = self.config.get_embedder_config()
+                        embedder_cfg = self._embedder_config
                     # デバッグログ: 実際に使われる URL/プロバイダ
                     try:
                         _prov = embedder_cfg.get("provider")
@@ -627,7 +946,7 @@ class CrewFactory:
             
             # Evolution Crewの場合、コールバックを追加
             if crew_name == "evolution_crew":
-                from evolution.evolution_callback import evolution_crew_callback, evolution_task_callback
+                evolution_crew_callback, evolution_task_callback = _evolution_callbacks()
                 
                 # Evolution設定から自動適用フラグを取得
                 evolution_config = self.crew_configs[crew_name].get("evolution_config", {})
@@ -641,7 +960,8 @@ class CrewFactory:
                           crew_name=crew_name)
             
             # すべての設定パラメータでクルーを作成
-            logger.info("Crew config used", crew_name=crew_name, config=truncate_dict(config))
+            if _debug_logging_enabled():
+                logger.debug("Crew config used", crew_name=crew_name, config=truncate_dict(config))
             try:
                 crew = Crew(**config)
                 # 生成後、テスト互換性のためにマネージャーを agents に追加
@@ -682,6 +1002,25 @@ class CrewFactory:
             logger.error(f"Failed to create crew", crew_name=crew_name, error=str(e))
             return None
 
+    def _build_crew_agents(self, agent_names: List[str]) -> tuple:
+        """
+        クルーのエージェントをまとめて生成
+
+        生成は順番に行う（create_agentはエージェントキャッシュや共有KnowledgeManagerを
+        ロック無しで更新するため、スレッドプールで並列化しない）。
+
+        Returns:
+            (設定順のエージェントリスト, エージェント名 -> エージェントのマップ)
+        """
+        agents = []
+        agent_map = {}
+        for agent_name in agent_names:
+            agent = self.create_agent(agent_name)
+            if agent:
+                agents.append(agent)
+                agent_map[agent_name] = agent
+        return agents, agent_map
+
     def get_crew(self, crew_name: str) -> Optional[Crew]:
         """
         クルーを取得または作成
@@ -692,38 +1031,107 @@ class CrewFactory:
         Returns:
             クルーインスタンスまたはNone
         """
-        # 既にアクティブかチェック
+        # 自動再読み込みが有効なら、YAMLの変更を取り込む（未変更ならstatのみでマージ済み結果を再利用）
+        if self._env.config_auto_reload:
+            self.agent_configs, self.task_configs, self.crew_configs = self._load_all_configs()
+        
+        # 既にアクティブで、生成元の設定が再読み込み後も変わっていなければ再利用
+        signature = self._crew_signature(crew_name)
         if crew_name in self.active_crews:
-            return self.active_crews[crew_name]
+            cached = self._crew_signatures.get(crew_name)
+            if cached is not None and len(cached) == len(signature) and all(
+                a is b for a, b in zip(cached, signature)
+            ):
+                return self.active_crews[crew_name]
+            logger.info("Crew config changed, rebuilding", crew_name=crew_name)
         
         # 新しいクルーを作成
         crew = self.create_crew(crew_name)
         if crew:
             self.active_crews[crew_name] = crew
+            self._crew_signatures[crew_name] = signature
         
         return crew
 
-    def get_active_crews(self) -> Dict[str, Crew]:
-        """すべてのアクティブなクルーを取得"""
-        return self.active_crews.copy()
+    def _crew_signature(self, crew_name: str) -> tuple:
+        """
+        クルーの生成に使う設定オブジェクト（クルー・エージェント・タスク）のタプルを取得
+
+        変更のないYAMLファイルはパース結果が再利用され同一オブジェクトのままのため、
+        要素の同一性比較だけで関連する設定が変わったかを判定できる。
+        """
+        crew_config = self.crew_configs.get(crew_name)
+        if crew_config is None:
+            return ()
+        task_configs = [self.task_configs.get(name) for name in crew_config.get("tasks", [])]
+        agent_names = list(crew_config.get("agents", []))
+        if crew_config.get("manager_agent"):
+            agent_names.append(crew_config["manager_agent"])
+        agent_names.extend(task.get("agent") for task in task_configs if isinstance(task, dict))
+        return (
+            crew_config,
+            *task_configs,
+            *(self.agent_configs.get(name) for name in agent_names)
+        )
+
+    def get_active_crews(self) -> Mapping[str, Crew]:
+        """
+        すべてのアクティブなクルーを取得
+
+        コピーではなく読み取り専用のビューを返す。変更可能なコピーが必要な場合は
+        dict(factory.get_active_crews()) とすること。
+        """
+        return self._active_crews_view
+
+    def _names_of(self, config_type: str, configs: Dict[str, Any]) -> tuple:
+        """設定名のタプルを取得（同じ設定辞書に対しては前回のタプルを再利用）"""
+        cached = self._config_names.get(config_type)
+        if cached is None or cached[0] is not configs or len(cached[1]) != len(configs):
+            cached = self._config_names[config_type] = (configs, tuple(configs))
+        return cached[1]
 
     def list_crews(self) -> List[str]:
         """利用可能なクルー設定をリスト表示"""
-        return list(self.crew_configs.keys())
+        return list(self._names_of("crews", self.crew_configs))
 
     def list_agents(self) -> List[str]:
         """利用可能なエージェント設定をリスト表示"""
-        return list(self.agent_configs.keys())
+        return list(self._names_of("agents", self.agent_configs))
 
     def list_tasks(self) -> List[str]:
         """利用可能なタスク設定をリスト表示"""
-        return list(self.task_configs.keys())
+        return list(self._names_of("tasks", self.task_configs))
 
-    def reload_configs(self) -> None:
-        """すべての設定を再読み込み"""
-        self.agent_configs = self._load_configs("agents")
-        self.task_configs = self._load_configs("tasks")
-        self.crew_configs = self._load_configs("crews")
+    def reload_configs(self, force: bool = True) -> bool:
+        """
+        すべての設定を再読み込み
+
+        明示的な呼び出しは常に再読み込みする。ホットリロード等で連続して呼ばれる経路では
+        force=Falseを指定すると、直前の再読み込みから_RELOAD_MIN_INTERVAL秒以内の呼び出しを
+        まとめて無視する（再走査を避ける）。
+
+        Args:
+            force: 間隔に関わらず再読み込みするかどうか
+
+        Returns:
+            再読み込みを実行した場合True、間隔内のためスキップした場合False
+        """
+        now = time.monotonic()
+        if not force and now - self._last_reload < _RELOAD_MIN_INTERVAL:
+            logger.debug(
+                "Skipping config reload (called too frequently)",
+                elapsed=round(now - self._last_reload, 3),
+                min_interval=_RELOAD_MIN_INTERVAL
+            )
+            return False
+        self._last_reload = now
+        
+        if force:
+            # 明示的な再読み込みではmtimeに依存せずファイル一覧も取り直す
+            _scan_yaml_files.cache_clear()
+        self._agent_kwargs_cache.clear()
+        self._config_names.clear()
+        self.agent_configs, self.task_configs, self.crew_configs = self._load_all_configs()
         
         logger.info(
             "Configurations reloaded",
@@ -731,6 +1139,7 @@ class CrewFactory:
             tasks=len(self.task_configs),
             crews=len(self.crew_configs)
         )
+        return True
 
     def shutdown_crew(self, crew_name: str) -> bool:
         """
@@ -745,6 +1154,7 @@ class CrewFactory:
         if crew_name in self.active_crews:
             # TODO: 適切なクルーシャットダウンを実装
             del self.active_crews[crew_name]
+            self._crew_signatures.pop(crew_name, None)
             logger.info(f"Crew shutdown", crew_name=crew_name)
             return True
         
@@ -752,8 +1162,7 @@ class CrewFactory:
 
     def shutdown_all(self) -> None:
         """すべてのアクティブなクルーをシャットダウン"""
-        crew_names = list(self.active_crews.keys())
-        for crew_name in crew_names:
+        for crew_name in tuple(self.active_crews):
             self.shutdown_crew(crew_name)
         
         logger.info("すべてのクルーがシャットダウンされました")
@@ -4,6 +4,8 @@ Evolution Crew用のコールバック関数
 """
 
 import json
+import queue
+import threading
 import structlog
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -13,10 +15,25 @@ from core.evolution_tracker import EvolutionTracker
 from core.knowledge_graph import KnowledgeGraphManager
 from crewai.crew import CrewOutput
 from crewai.task import TaskOutput
+try:
+    import orjson  # 高速なJSONシリアライザ（任意依存）
+except ImportError:  # pragma: no cover
+    orjson = None
 
 logger = structlog.get_logger()
 
 
+def _dumps_indented(value: Any) -> str:
+    """インデント付きJSON文字列に変換（orjsonが利用可能なら使用）"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # orjsonで扱えない型が含まれる場合は標準jsonに任せる
+            pass
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
 class EvolutionCallback:
     """Evolution Crewのコールバッククラス"""
     
@@ -24,7 +41,8 @@ class EvolutionCallback:
                  evolution_tracker: Optional[EvolutionTracker] = None,
                  knowledge_graph: Optional[KnowledgeGraphManager] = None,
                  auto_apply: bool = False,
-                 confidence_threshold: float = 0.8):
+                 confidence_threshold: float = 0.8,
+                 background: bool = False):
         """
         初期化
         
@@ -33,27 +51,67 @@ class EvolutionCallback:
             knowledge_graph: 知識グラフマネージャー
             auto_apply: 自動適用するかどうか
             confidence_threshold: 自動適用の信頼度閾値
+            background: クルー完了後の処理をワーカースレッドで実行するかどうか
+                （Trueの場合、クルー出力には投入状態のみが入り、結果は last_result で参照する）
         """
-        self.evolution_tracker = evolution_tracker or EvolutionTracker()
-        self.knowledge_graph = knowledge_graph or KnowledgeGraphManager()
+        # 未指定のトラッカー・知識グラフ・AdaptiveEvolutionEngineは初回アクセス時に生成
+        self._evolution_tracker = evolution_tracker or None
+        self._knowledge_graph = knowledge_graph or None
+        self._adaptive_engine: Optional[AdaptiveEvolutionEngine] = None
+        self._init_lock = threading.RLock()
         self.auto_apply = auto_apply
         self.confidence_threshold = confidence_threshold
         
-        # AdaptiveEvolutionEngineを初期化
-        self.adaptive_engine = AdaptiveEvolutionEngine(
-            evolution_tracker=self.evolution_tracker,
-            knowledge_graph=self.knowledge_graph,
-            auto_apply_threshold=confidence_threshold
-        )
+        # クルースレッドをブロックしないためのバックグラウンド処理
+        self.background = background
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._queue: "queue.Queue[int]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._version = 0
         
         logger.info("Evolution callback initialized",
                    auto_apply=auto_apply,
                    confidence_threshold=confidence_threshold)
     
+    @property
+    def evolution_tracker(self) -> EvolutionTracker:
+        """進化トラッカー（未指定なら初回アクセス時に生成）"""
+        if self._evolution_tracker is None:
+            with self._init_lock:
+                if self._evolution_tracker is None:
+                    self._evolution_tracker = EvolutionTracker()
+        return self._evolution_tracker
+    
+    @property
+    def knowledge_graph(self) -> KnowledgeGraphManager:
+        """知識グラフマネージャー（未指定なら初回アクセス時に生成）"""
+        if self._knowledge_graph is None:
+            with self._init_lock:
+                if self._knowledge_graph is None:
+                    self._knowledge_graph = KnowledgeGraphManager()
+        return self._knowledge_graph
+    
+    @property
+    def adaptive_engine(self) -> AdaptiveEvolutionEngine:
+        """AdaptiveEvolutionEngine（初回アクセス時に生成）"""
+        if self._adaptive_engine is None:
+            with self._init_lock:
+                if self._adaptive_engine is None:
+                    self._adaptive_engine = AdaptiveEvolutionEngine(
+                        evolution_tracker=self.evolution_tracker,
+                        knowledge_graph=self.knowledge_graph,
+                        auto_apply_threshold=self.confidence_threshold
+                    )
+        return self._adaptive_engine
+    
     def on_crew_complete(self, crew_output: CrewOutput) -> CrewOutput:
         """
         クルー実行完了時のコールバック
         
+        backgroundが有効な場合は処理をワーカースレッドに投入して即座に返す。
+        結果は last_result で参照できる（wait_until_idle で完了を待機可能）。
+        
         Args:
             crew_output: クルーの実行結果
             
@@ -62,75 +120,52 @@ class EvolutionCallback:
         """
         logger.info("Evolution crew completed, processing results")
         
+        if not self.background:
+            return self.process_crew_output(crew_output)
+        
+        with self._worker_lock:
+            self._version += 1
+            version = self._version
+            self._queue.put(version)
+            if self._worker is None:
+                # 終了時にファイル書き込みの途中で止まらないよう非デーモンスレッドとする
+                self._worker = threading.Thread(
+                    target=self._worker_loop,
+                    name="evolution-callback",
+                    daemon=False
+                )
+                self._worker.start()
+        
+        if crew_output.json_dict is None:
+            crew_output.json_dict = {}
+        
+        crew_output.json_dict["adaptive_evolution"] = {
+            "status": "queued",
+            "version": version,
+            "auto_apply": self.auto_apply,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        return crew_output
+    
+    def process_crew_output(self, crew_output: CrewOutput) -> CrewOutput:
+        """
+        適応処理を同期的に実行し、結果をクルー出力に追加
+        
+        Args:
+            crew_output: クルーの実行結果
+            
+        Returns:
+            処理後のクルー出力
+        """
         try:
-            # パフォーマンストレンドを分析
-            trends = self.adaptive_engine.analyze_performance_trends()
+            result = self._run_adaptation()
             
-            if trends["status"] == "analyzed":
-                logger.info("Performance trends analyzed",
-                          system_trend=trends["system_trend"]["trend"],
-                          improvement_areas=len(trends["improvement_areas"]))
-                
-                # 推奨事項を取得
-                recommendations = trends["recommendations"]
-                
-                if recommendations:
-                    logger.info(f"Generated {len(recommendations)} recommendations")
-                    
-                    # 自動適用が有効な場合
-                    if self.auto_apply:
-                        results = self.adaptive_engine.apply_adaptations(
-                            recommendations,
-                            dry_run=False
-                        )
-                        
-                        logger.info("Applied adaptations",
-                                  applied=len(results["applied"]),
-                                  skipped=len(results["skipped"]),
-                                  failed=len(results["failed"]))
-                        
-                        # 結果を知識グラフに記録
-                        self._record_to_knowledge_graph(trends, results)
-                        
-                        # クルー出力に適応結果を追加
-                        if crew_output.json_dict is None:
-                            crew_output.json_dict = {}
-                        
-                        crew_output.json_dict["adaptive_evolution"] = {
-                            "trends": trends,
-                            "adaptations": results,
-                            "timestamp": datetime.now().isoformat()
-                        }
-                    else:
-                        # ドライランで結果を確認
-                        dry_run_results = self.adaptive_engine.apply_adaptations(
-                            recommendations,
-                            dry_run=True
-                        )
-                        
-                        logger.info("Dry run completed",
-                                  would_apply=len(dry_run_results["applied"]),
-                                  would_skip=len(dry_run_results["skipped"]))
-                        
-                        if crew_output.json_dict is None:
-                            crew_output.json_dict = {}
-                        
-                        crew_output.json_dict["adaptive_evolution"] = {
-                            "trends": trends,
-                            "dry_run_results": dry_run_results,
-                            "auto_apply": False,
-                            "timestamp": datetime.now().isoformat()
-                        }
+            if result is not None:
+                if crew_output.json_dict is None:
+                    crew_output.json_dict = {}
                 
-                # 適応レポートを生成
-                report = self.adaptive_engine.get_adaptation_report()
-                logger.info("Adaptation report generated",
-                          total_adaptations=report.get("total_adaptations", 0),
-                          improvement_rate=report.get("success_rate_improvement", 0))
-            
-            else:
-                logger.warning("Insufficient data for analysis",
-                             status=trends["status"])
+                crew_output.json_dict["adaptive_evolution"] = result
         
         except Exception as e:
             logger.error("Error in evolution callback", error=str(e))
@@ -142,6 +177,127 @@ class EvolutionCallback:
         
         return crew_output
     
+    def wait_until_idle(self) -> None:
+        """投入済みのバックグラウンド処理がすべて完了するまで待機"""
+        self._queue.join()
+    
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        ワーカースレッドの終了を待機
+        
+        Args:
+            timeout: 最大待機秒数（Noneの場合は完了まで待機）
+            
+        Returns:
+            ワーカーが終了していればTrue
+        """
+        with self._worker_lock:
+            worker = self._worker
+        if worker is None:
+            return True
+        worker.join(timeout)
+        return not worker.is_alive()
+    
+    def _worker_loop(self) -> None:
+        """投入されたクルー完了通知を順に処理するワーカー（キューが空になったら終了）"""
+        while True:
+            with self._worker_lock:
+                if self._queue.empty():
+                    self._worker = None
+                    return
+                version = self._queue.get_nowait()
+            
+            try:
+                # 後続の投入がある場合は古い分析を破棄（最新の投入で同じ履歴を分析する）
+                if version < self._version:
+                    logger.debug("Skipping stale evolution request", version=version)
+                    continue
+                
+                result = self._run_adaptation()
+                if result is not None:
+                    result["version"] = version
+                    self.last_result = result
+            
+            except Exception as e:
+                logger.error("Error in evolution callback", error=str(e))
+                self.last_result = {"error": str(e), "version": version}
+            
+            finally:
+                self._queue.task_done()
+    
+    def _run_adaptation(self) -> Optional[Dict[str, Any]]:
+        """
+        トレンド分析・適応適用・知識グラフ記録を実行
+        
+        Returns:
+            クルー出力に追加する適応結果（推奨事項が無い場合はNone）
+        """
+        result = None
+        
+        # パフォーマンストレンドを分析
+        trends = self.adaptive_engine.analyze_performance_trends()
+        
+        if trends["status"] == "analyzed":
+            logger.info("Performance trends analyzed",
+                      system_trend=trends["system_trend"]["trend"],
+                      improvement_areas=len(trends["improvement_areas"]))
+            
+            # 推奨事項を取得
+            recommendations = trends["recommendations"]
+            
+            if recommendations:
+                logger.info("Generated recommendations", count=len(recommendations))
+                
+                # 自動適用が有効な場合
+                if self.auto_apply:
+                    results = self.adaptive_engine.apply_adaptations(
+                        recommendations,
+                        dry_run=False
+                    )
+                    
+                    logger.info("Applied adaptations",
+                              applied=len(results["applied"]),
+                              skipped=len(results["skipped"]),
+                              failed=len(results["failed"]))
+                    
+                    # 結果を知識グラフに記録
+                    self._record_to_knowledge_graph(trends, results)
+                    
+                    result = {
+                        "trends": trends,
+                        "adaptations": results,
+                        "timestamp": datetime.now().isoformat()
+                    }
+                else:
+                    # ドライランで結果を確認
+                    dry_run_results = self.adaptive_engine.apply_adaptations(
+                        recommendations,
+                        dry_run=True
+                    )
+                    
+                    logger.info("Dry run completed",
+                              would_apply=len(dry_run_results["applied"]),
+                              would_skip=len(dry_run_results["skipped"]))
+                    
+                    result = {
+                        "trends": trends,
+                        "dry_run_results": dry_run_results,
+                        "auto_apply": False,
+                        "timestamp": datetime.now().isoformat()
+                    }
+            
+            # 適応レポートを生成
+            report = self.adaptive_engine.get_adaptation_report()
+            logger.info("Adaptation report generated",
+                      total_adaptations=report.get("total_adaptations", 0),
+                      improvement_rate=report.get("success_rate_improvement", 0))
+        
+        else:
+            logger.warning("Insufficient data for analysis",
+                         status=trends["status"])
+        
+        return result
+    
     def on_task_complete(self, task_output: TaskOutput) -> None:
         """
         タスク完了時のコールバック
@@ -180,23 +336,25 @@ class EvolutionCallback:
             # 適応履歴をノードとして追加
             from core.knowledge_graph import KnowledgeNode
             
+            now = datetime.now()
+            applied = results["applied"]
             node = KnowledgeNode(
-                id=f"adaptation_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                id=f"adaptation_{now.strftime('%Y%m%d_%H%M%S')}",
                 title="Adaptive Evolution Result",
-                content=json.dumps({
+                content=_dumps_indented({
                     "trends": trends,
                     "results": results
-                }, indent=2, ensure_ascii=False),
+                }),
                 node_type="adaptation",
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
+                created_at=now,
+                updated_at=now,
                 metadata={
                     "system_trend": trends["system_trend"]["trend"],
-                    "applied_count": len(results["applied"]),
+                    "applied_count": len(applied),
                     "confidence_avg": sum(
                         r["recommendation"]["confidence"] 
-                        for r in results["applied"]
-                    ) / max(len(results["applied"]), 1)
+                        for r in applied
+                    ) / max(len(applied), 1)
                 }
             )
             
@@ -205,17 +363,17 @@ class EvolutionCallback:
                           node_id=node.id)
             
             # 成功した適応があれば、関連する知識ノードとリンク
-            if results["applied"]:
+            if applied:
                 from core.knowledge_graph import KnowledgeRelation
                 
-                for applied in results["applied"]:
-                    if "knowledge" in str(applied.get("recommendation", {}).get("target", "")):
+                for adaptation in applied:
+                    if "knowledge" in str(adaptation.get("recommendation", {}).get("target", "")):
                         # 知識関連の適応の場合、関係を追加
                         relation = KnowledgeRelation(
                             source=node.id,
                             target="adaptive_knowledge",
                             relation_type="generated",
-                            weight=applied["recommendation"]["confidence"]
+                            weight=adaptation["recommendation"]["confidence"]
                         )
                         self.knowledge_graph.add_relation(relation)
         
@@ -241,6 +399,31 @@ def create_evolution_callback(auto_apply: bool = False,
     )
 
 
+# 関数形式のコールバックで共有する既定インスタンス（トラッカー・知識グラフの再生成を避ける）
+_DEFAULT_CALLBACK: Optional[EvolutionCallback] = None
+_DEFAULT_CALLBACK_LOCK = threading.Lock()
+
+
+def _get_default_callback() -> EvolutionCallback:
+    """既定のEvolutionCallbackを取得（初回呼び出し時に生成）"""
+    global _DEFAULT_CALLBACK
+    if _DEFAULT_CALLBACK is None:
+        with _DEFAULT_CALLBACK_LOCK:
+            if _DEFAULT_CALLBACK is None:
+                _DEFAULT_CALLBACK = create_evolution_callback(
+                    auto_apply=False,  # デフォルトはドライラン
+                    confidence_threshold=0.8
+                )
+    return _DEFAULT_CALLBACK
+
+
+def reset_default_callback() -> None:
+    """既定のEvolutionCallbackを破棄（テストや設定変更後に使用）"""
+    global _DEFAULT_CALLBACK
+    with _DEFAULT_CALLBACK_LOCK:
+        _DEFAULT_CALLBACK = None
+
+
 # クルー完了時のコールバック関数（関数形式）
 def evolution_crew_callback(crew_output: CrewOutput) -> CrewOutput:
     """
@@ -248,11 +431,7 @@ def evolution_crew_callback(crew_output: CrewOutput) -> CrewOutput:
     
     これは crew_factory で直接使用できる関数形式
     """
-    callback = create_evolution_callback(
-        auto_apply=False,  # デフォルトはドライラン
-        confidence_threshold=0.8
-    )
-    return callback.on_crew_complete(crew_output)
+    return _get_default_callback().on_crew_complete(crew_output)
 
 
 # タスク完了時のコールバック関数（関数形式）
@@ -260,5 +439,4 @@ def evolution_task_callback(task_output: TaskOutput) -> None:
     """
     Evolution タスク完了時のコールバック関数
     """
-    callback = create_evolution_callback()
-    callback.on_task_complete(task_output)
\ No newline at end of file
+    _get_default_callback().on_task_complete(task_output)
@@ -4,10 +4,18 @@
 """
 
 import os
+import copy
+import glob
+import itertools
 import yaml
 import re
 import json
-from typing import Dict, List, Any, Tuple, Optional
+import shutil
+import tempfile
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Tuple, Optional
 from pathlib import Path
 from datetime import datetime
 import structlog
@@ -16,6 +24,42 @@ from evolution.knowledge_applier import KnowledgeApplier
 
 logger = structlog.get_logger()
 
+# libyamlが利用可能ならCのローダー/ダンパーを使用（無ければ純Python実装）
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# 変更内容から更新対象のキーワードを抽出するパターン
+_KEYWORD_RE = re.compile(r'\b(?:update|change|modify|replace)\s+(\w+)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=64)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """YAMLファイルをCローダーで読み込む（更新時刻とサイズが変われば別エントリとして再読み込み）"""
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+def _current_umask() -> int:
+    """現在のumaskを取得（取得にはいったん設定し直す必要がある）"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+@lru_cache(maxsize=256)
+def _section_re(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    """いずれかのキーワードで始まるセクション（空行まで）のパターンを取得（1回の走査で検索）"""
+    alternation = "|".join(map(re.escape, keywords))
+    return re.compile(rf'((?:{alternation}).*?)(?=\n\n|\Z)', re.IGNORECASE | re.DOTALL)
+
+
+@lru_cache(maxsize=256)
+def _remove_re(pattern: str) -> "re.Pattern[str]":
+    """削除用パターンをコンパイル（同じパターンの再解析を避ける）"""
+    return re.compile(pattern, re.MULTILINE)
+
 
 class ImprovementApplier:
     """進化改善をシステムファイルに適用"""
@@ -24,6 +68,11 @@ class ImprovementApplier:
         self.base_path = Path(base_path)
         self.backup_dir = self.base_path / "evolution" / "backups"
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        # 対象ファイル名 -> バックアップパス（古い順）。復元時のglob/statを避ける
+        # 他のインスタンス・プロセスの作成分はディレクトリのmtime変化または索引の不一致時に取り込む
+        self._backup_lock = threading.Lock()
+        self._backup_dir_stamp = self._current_backup_dir_stamp()
+        self._backup_index: Dict[str, List[Path]] = self._scan_backups()
         # 知識管理専用Applierのインスタンス化
         self.knowledge_applier = KnowledgeApplier(self.base_path / "knowledge")
     
@@ -56,6 +105,9 @@ class ImprovementApplier:
         # 知識関連の変更のみを処理
         knowledge_changes = []
         
+        # 提案の記録時刻は呼び出しごとに1回だけ取得
+        timestamp = datetime.now().isoformat()
+        
         for file_path, action, change_data in changes:
             if file_path.startswith("knowledge/"):
                 # 知識ファイルの変更はKnowledgeApplierに委譲
@@ -78,7 +130,7 @@ class ImprovementApplier:
                         "file_path": file_path,
                         "action": action,
                         "changes": change_data,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": timestamp
                     })
                     
                 logger.warning(
@@ -122,48 +174,54 @@ class ImprovementApplier:
             "skipped": []
         }
         
-        # KnowledgeApplier用のフォーマットに変換
-        formatted_changes = []
-        for file_path, action, change_data in knowledge_changes:
-            if action == "add":
-                formatted_change = {
-                    "type": "add_knowledge",
-                    "file": file_path,
-                    "content": change_data.get("content", ""),
-                    "category": self._detect_category(file_path),
-                    "title": change_data.get("title", self._extract_title(change_data.get("content", ""))),
-                    "tags": change_data.get("tags", []),
-                    "reason": change_data.get("reason", "Added by Evolution System")
-                }
-            elif action == "update":
-                formatted_change = {
-                    "type": "update_knowledge",
-                    "file": file_path,
-                    "content": change_data.get("change", change_data.get("content", "")),
-                    "section": change_data.get("section"),
-                    "operation": "append",
-                    "reason": change_data.get("reason", "Updated by Evolution System")
-                }
-            else:
-                continue
-            
-            formatted_changes.append(formatted_change)
+        # KnowledgeApplier用のフォーマットに変換（未対応のアクションは除外）
+        formatters = {
+            "add": self._format_knowledge_add,
+            "update": self._format_knowledge_update,
+        }
+        formatted_changes = [
+            formatter(file_path, change_data)
+            for file_path, action, change_data in knowledge_changes
+            if (formatter := formatters.get(action)) is not None
+        ]
         
         # KnowledgeApplierで処理
         if formatted_changes:
             applier_results = self.knowledge_applier.apply_knowledge_changes(formatted_changes, dry_run)
             
-            # 結果を統合
+            # 結果を統合（success/error以外はスキップ扱い）
+            buckets = {"success": results["applied"], "error": results["failed"]}
+            skipped = results["skipped"]
             for result in applier_results:
-                if result["status"] == "success":
-                    results["applied"].append(result)
-                elif result["status"] == "error":
-                    results["failed"].append(result)
-                else:
-                    results["skipped"].append(result)
+                buckets.get(result["status"], skipped).append(result)
         
         return results
     
+    def _format_knowledge_add(self, file_path: str, change_data: Dict[str, Any]) -> Dict[str, Any]:
+        """addをKnowledgeApplierのadd_knowledge形式に変換"""
+        content = change_data.get("content", "")
+        return {
+            "type": "add_knowledge",
+            "file": file_path,
+            "content": content,
+            "category": self._detect_category(file_path),
+            # タイトル指定がある場合は本文からの抽出を省略
+            "title": change_data["title"] if "title" in change_data else self._extract_title(content),
+            "tags": change_data.get("tags", []),
+            "reason": change_data.get("reason", "Added by Evolution System")
+        }
+    
+    def _format_knowledge_update(self, file_path: str, change_data: Dict[str, Any]) -> Dict[str, Any]:
+        """updateをKnowledgeApplierのupdate_knowledge形式に変換"""
+        return {
+            "type": "update_knowledge",
+            "file": file_path,
+            "content": change_data.get("change", change_data.get("content", "")),
+            "section": change_data.get("section"),
+            "operation": "append",
+            "reason": change_data.get("reason", "Updated by Evolution System")
+        }
+    
     def _detect_category(self, file_path: str) -> str:
         """ファイルパスからカテゴリを検出"""
         if "agents" in file_path:
@@ -224,6 +282,7 @@ class ImprovementApplier:
         dry_run: bool
     ) -> Dict[str, Any]:
         """ファイルにコンテンツを追加"""
+        timestamp = datetime.now().isoformat()
         content = change_data.get("content", "")
         
         if not content:
@@ -257,14 +316,10 @@ class ImprovementApplier:
                 logger.info("Redirecting evolution history to dedicated file", file=str(file_path))
             
             if file_path.suffix == ".md":
-                # Markdownファイルの場合
-                existing = ""
-                is_new_file = False
+                # Markdownファイルの場合（既存ファイルは読み込まず末尾に追記する）
+                is_new_file = not file_path.exists()
                 
-                if file_path.exists():
-                    existing = file_path.read_text(encoding="utf-8")
-                else:
-                    is_new_file = True
+                if is_new_file:
                     # ディレクトリが存在しない場合は作成
                     file_path.parent.mkdir(parents=True, exist_ok=True)
                 
@@ -279,7 +334,7 @@ Each entry represents an improvement or change made by the Evolution System.
 
 ---
 
-## Evolution Update - {datetime.now().isoformat()}
+## Evolution Update - {timestamp}
 
 {content}
 
@@ -288,7 +343,7 @@ Each entry represents an improvement or change made by the Evolution System.
 """
                     else:
                         # 通常の新規ファイル
-                        new_content = f"# {file_path.stem.replace('_', ' ').title()}\n\n{content}\n\n---\n*Generated by OKAMI Evolution System on {datetime.now().isoformat()}*\n"
+                        new_content = f"# {file_path.stem.replace('_', ' ').title()}\n\n{content}\n\n---\n*Generated by OKAMI Evolution System on {timestamp}*\n"
                     
                     if not dry_run:
                         file_path.write_text(new_content, encoding="utf-8")
@@ -307,10 +362,11 @@ Each entry represents an improvement or change made by the Evolution System.
                     }
                 else:
                     # 既存ファイルに追記
-                    new_content = f"\n\n## Evolution Update - {datetime.now().isoformat()}\n\n{content}\n"
+                    new_content = f"\n\n## Evolution Update - {timestamp}\n\n{content}\n"
                     
                     if not dry_run:
-                        file_path.write_text(existing + new_content, encoding="utf-8")
+                        with file_path.open("a", encoding="utf-8") as f:
+                            f.write(new_content)
                         logger.info(
                             "Updated existing file",
                             file=str(file_path),
@@ -350,6 +406,7 @@ Each entry represents an improvement or change made by the Evolution System.
         dry_run: bool
     ) -> Dict[str, Any]:
         """ファイルのコンテンツを更新"""
+        timestamp = datetime.now().isoformat()
         change = change_data.get("change", "")
         
         if not change:
@@ -374,18 +431,19 @@ Each entry represents an improvement or change made by the Evolution System.
             # ファイルタイプに基づいてインテリジェントな更新を適用
             if file_path.suffix == ".md":
                 # Markdownの場合、新しいセクションとして追加
-                new_content = content + f"\n\n## Update - {datetime.now().isoformat()}\n\n{change}\n"
+                new_content = content + f"\n\n## Update - {timestamp}\n\n{change}\n"
+                changed = True
             else:
                 # その他のファイルの場合、関連セクションを検索して置換
-                new_content = self._intelligent_update(content, change)
+                new_content, changed = self._intelligent_update(content, change)
             
-            if not dry_run and new_content != content:
+            if not dry_run and changed:
                 file_path.write_text(new_content, encoding="utf-8")
             
             return {
                 "file": str(file_path),
                 "action": "update",
-                "status": "applied" if new_content != content else "skipped",
+                "status": "applied" if changed else "skipped",
                 "changes": len(new_content) - len(content)
             }
             
@@ -433,15 +491,13 @@ Each entry represents an improvement or change made by the Evolution System.
                 }
             
             # YAMLをロード
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
+            data = self._yaml_load(file_path) or {}
             
             # フィールドを更新（ドット表記でネストされたフィールドをサポート）
             self._update_nested_field(data, field, value)
             
             if not dry_run:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+                self._write_yaml(file_path, data)
             
             return {
                 "file": str(file_path),
@@ -486,16 +542,25 @@ Each entry represents an improvement or change made by the Evolution System.
                 }
             
             content = file_path.read_text(encoding="utf-8")
-            new_content = re.sub(pattern, "", content, flags=re.MULTILINE)
-            
-            if not dry_run and new_content != content:
-                file_path.write_text(new_content, encoding="utf-8")
+            # 置換後の文字列全体を作らず、一致しなかった区間だけを一時ファイルへ順に書き出す
+            spans = [match.span() for match in _remove_re(pattern).finditer(content) if match.end() > match.start()]
+            removed_chars = sum(end - start for start, end in spans)
+            
+            if not dry_run and spans:
+                def write_remaining(f) -> None:
+                    position = 0
+                    for start, end in spans:
+                        f.write(content[position:start])
+                        position = end
+                    f.write(content[position:])
+                
+                self._replace_file(file_path, write_remaining)
             
             return {
                 "file": str(file_path),
                 "action": "remove",
-                "status": "applied" if new_content != content else "skipped",
-                "removed_chars": len(content) - len(new_content)
+                "status": "applied" if spans else "skipped",
+                "removed_chars": removed_chars
             }
             
         except Exception as e:
@@ -510,11 +575,10 @@ Each entry represents an improvement or change made by the Evolution System.
         """YAMLファイルにコンテンツを追加"""
         try:
             # コンテンツをYAMLとして解析を試みる
-            new_data = yaml.safe_load(content)
+            new_data = yaml.load(content, Loader=_YamlLoader)
             
             if file_path.exists():
-                with open(file_path, "r", encoding="utf-8") as f:
-                    existing_data = yaml.safe_load(f) or {}
+                existing_data = self._yaml_load(file_path) or {}
             else:
                 existing_data = {}
             
@@ -531,9 +595,7 @@ Each entry represents an improvement or change made by the Evolution System.
                 }
             
             if not dry_run:
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(file_path, "w", encoding="utf-8") as f:
-                    yaml.dump(merged_data, f, default_flow_style=False, allow_unicode=True)
+                self._write_yaml(file_path, merged_data)
             
             return {
                 "file": str(file_path),
@@ -545,14 +607,10 @@ Each entry represents an improvement or change made by the Evolution System.
         except yaml.YAMLError:
             # 有効なYAMLでない場合、テキストとして扱いコメントとして追加
             if not dry_run:
-                if file_path.exists():
-                    existing = file_path.read_text(encoding="utf-8")
-                else:
-                    existing = ""
-                
-                new_content = existing + f"\n# Evolution update: {content}\n"
+                # 再ダンプせず末尾に追記（既存の書式・コメントを保持）
                 file_path.parent.mkdir(parents=True, exist_ok=True)
-                file_path.write_text(new_content, encoding="utf-8")
+                with open(file_path, "a", encoding="utf-8") as f:
+                    f.write(f"\n# Evolution update: {content}\n")
             
             return {
                 "file": str(file_path),
@@ -561,27 +619,78 @@ Each entry represents an improvement or change made by the Evolution System.
                 "added_as_comment": True
             }
     
-    def _intelligent_update(self, content: str, change: str) -> str:
-        """コンテンツにインテリジェントな更新を適用"""
+    @staticmethod
+    def _yaml_load(file_path: Path) -> Any:
+        """YAMLファイルを読み込む（未変更ならキャッシュの複製を返す）"""
+        stat = file_path.stat()
+        data = _load_yaml_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+        # 呼び出し側で変更されてもキャッシュが汚れないよう複製を返す
+        return copy.deepcopy(data)
+    
+    @staticmethod
+    def _yaml_dump(data: Any, stream: Any = None) -> Optional[str]:
+        """YAMLをCダンパーで書き出す（streamがNoneなら文字列で返す）"""
+        return yaml.dump(data, stream, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
+    
+    def _write_yaml(self, file_path: Path, data: Any) -> None:
+        """YAMLを同じディレクトリの一時ファイルに書き出し、置き換えでアトミックに保存"""
+        # ダンパーのトークン単位の書き込みをファイルに流さず、メモリ上で組み立ててから1回で書き込む
+        payload = self._yaml_dump(data)
+        self._replace_file(file_path, lambda f: f.write(payload))
+    
+    @staticmethod
+    def _replace_file(file_path: Path, writer: Callable[[Any], None]) -> None:
+        """writerで一時ファイルに書き出し、元ファイルをアトミックに置き換える（パーミッションは維持）"""
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                writer(f)
+            if file_path.exists():
+                shutil.copymode(file_path, tmp_path)
+            else:
+                # mkstempは0600で作成するため、新規ファイルは通常の作成と同じくumaskに従わせる
+                os.chmod(tmp_path, 0o666 & ~_current_umask())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    def _intelligent_update(self, content: str, change: str) -> Tuple[str, bool]:
+        """
+        コンテンツにインテリジェントな更新を適用
+
+        Returns:
+            (更新後のコンテンツ, 変更があったか)。同じ変更が既に反映済みなら変更なしとして返す
+        """
         # これはシンプルな実装 - NLPで強化可能
         
-        # 変更内のキーワードを探す
-        keywords = re.findall(r'\b(?:update|change|modify|replace)\s+(\w+)', change, re.IGNORECASE)
-        
-        for keyword in keywords:
-            # 関連セクションを検索して更新を試みる
-            pattern = rf'({keyword}.*?)(?=\n\n|\Z)'
-            if re.search(pattern, content, re.IGNORECASE | re.DOTALL):
-                content = re.sub(
-                    pattern,
-                    f"\\1\n# Updated: {change}",
-                    content,
-                    flags=re.IGNORECASE | re.DOTALL
-                )
-                return content
-        
-        # 特定のセクションが見つからない場合、コメントとして追加
-        return content + f"\n# Evolution suggestion: {change}\n"
+        # 変更内のキーワードを探す（重複を除き出現順を維持）
+        keywords = tuple(dict.fromkeys(_KEYWORD_RE.findall(change)))
+        
+        if keywords:
+            # 関連セクションを全キーワードまとめて検索・更新
+            # 既に同じ更新行で終わっているセクションはそのままにする（セクションごとに判定）
+            # 末尾の改行の後ろではなく直前に追加し、更新行がセクションから離れないようにする
+            marker = f"\n# Updated: {change}"
+            
+            def append_marker(match: "re.Match[str]") -> str:
+                section = match.group(1)
+                body = section.rstrip("\n")
+                if body.endswith(marker):
+                    return section
+                return body + marker + section[len(body):]
+            
+            new_content, count = _section_re(keywords).subn(append_marker, content)
+            if count:
+                return new_content, new_content != content
+        
+        # 特定のセクションが見つからない場合、コメントとして追加（同じ行が既にあれば追加しない）
+        suggestion = f"# Evolution suggestion: {change}"
+        if f"\n{suggestion}\n" in f"\n{content}\n":
+            return content, False
+        return content + f"\n{suggestion}\n", True
     
     def _update_nested_field(self, data: Dict[str, Any], field: str, value: Any) -> None:
         """辞書内のネストされたフィールドを更新"""
@@ -590,33 +699,52 @@ Each entry represents an improvement or change made by the Evolution System.
         
         # ターゲットフィールドの親に移動
         for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
+            current = current.setdefault(part, {})
+            if not isinstance(current, dict):
+                raise TypeError(f"'{part}' is not a mapping in field '{field}'")
         
         # 値を設定
         current[parts[-1]] = value
     
     def _deep_merge(self, dict1: Dict[str, Any], dict2: Dict[str, Any]) -> Dict[str, Any]:
-        """2つの辞書をディープマージ"""
-        result = dict1.copy()
+        """
+        2つの辞書をディープマージ
         
-        for key, value in dict2.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
-            else:
-                result[key] = value
+        dict1をその場で更新して返す（ネストごとの複製と再帰呼び出しを避けるため明示的なスタックで処理）。
+        """
+        stack = [(dict1, dict2)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    stack.append((current, value))
+                else:
+                    target[key] = value
         
-        return result
+        return dict1
     
     def _create_backup(self, file_path: Path) -> Path:
-        """ファイルのバックアップを作成"""
+        """ファイルのバックアップを作成（名前は<タイムスタンプ>_<連番>で一意にする）"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"{file_path.name}.{timestamp}.bak"
-        backup_path = self.backup_dir / backup_name
         
-        # ファイルをバックアップにコピー
-        backup_path.write_bytes(file_path.read_bytes())
+        # 同一秒内のバックアップ（他のインスタンス・プロセスの作成分を含む）を上書きしないよう、
+        # 排他的に作成できた最初の連番を使う。連番は固定幅なので名前の文字列順が作成順と一致する
+        for sequence in itertools.count():
+            backup_path = self.backup_dir / f"{file_path.name}.{timestamp}_{sequence:06d}.bak"
+            try:
+                os.close(os.open(backup_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+                break
+            except FileExistsError:
+                continue
+        
+        # ファイルをバックアップにコピー（全体をメモリに読み込まず、カーネル内コピーを利用）
+        # 追記などで元ファイルをその場で書き換える経路があるため、ハードリンクは使わない
+        shutil.copyfile(file_path, backup_path)
+        
+        with self._backup_lock:
+            # ディレクトリのmtimeは記録し直さない（同時に他所で作成されたバックアップを見落とさないよう、次の復元で再走査させる）
+            self._backup_index[file_path.name].append(backup_path)
         
         logger.info(
             "Created backup",
@@ -626,6 +754,40 @@ Each entry represents an improvement or change made by the Evolution System.
         
         return backup_path
     
+    def _scan_backups(self) -> Dict[str, List[Path]]:
+        """バックアップディレクトリを一度だけ走査してインデックスを構築"""
+        index: Dict[str, List[Tuple[str, Path]]] = defaultdict(list)
+        for entry in self.backup_dir.iterdir():
+            name = entry.name
+            if not name.endswith(".bak"):
+                continue
+            target, sep, timestamp = name[:-4].rpartition(".")
+            if sep:
+                index[target].append((timestamp, entry))
+        
+        # タイムスタンプ（%Y%m%d_%H%M%S_連番）は文字列順で時系列順になる
+        result: Dict[str, List[Path]] = defaultdict(list)
+        for target, entries in index.items():
+            entries.sort(key=lambda x: x[0])
+            result[target] = [path for _, path in entries]
+        return result
+    
+    def _current_backup_dir_stamp(self) -> int:
+        """バックアップディレクトリのmtime（エントリの追加・削除で変化する）"""
+        return os.stat(self.backup_dir).st_mtime_ns
+    
+    def _glob_backups(self, name: str) -> List[Path]:
+        """対象ファイルのバックアップをディレクトリから直接取得し、索引を更新"""
+        prefix = f"{name}."
+        backups = sorted(
+            (path for path in self.backup_dir.glob(f"{glob.escape(name)}.*.bak")
+             if "." not in path.name[len(prefix):-4]),
+            key=lambda path: path.name
+        )
+        with self._backup_lock:
+            self._backup_index[name] = backups
+        return backups
+    
     def _save_proposed_config_changes(self, changes: List[Dict[str, Any]]) -> None:
         """
         提案されたconfig変更を記録ファイルに保存
@@ -665,32 +827,49 @@ Each entry represents an improvement or change made by the Evolution System.
                 error=str(e)
             )
     
+    @staticmethod
+    def _select_backup(backups: List[Path], backup_time: Optional[str]) -> Optional[Path]:
+        """復元するバックアップを選択（索引は古い順なので新しい順に走査）"""
+        if not backups:
+            return None
+        if not backup_time:
+            # 最新のものを使用
+            return backups[-1]
+        # 時間に一致するバックアップを検索
+        for backup in reversed(backups):
+            if backup_time in str(backup):
+                return backup
+        return None
+    
     def restore_backup(self, file_path: str, backup_time: Optional[str] = None) -> bool:
         """バックアップからファイルを復元"""
         try:
             full_path = self.base_path / file_path
-            backups = list(self.backup_dir.glob(f"{full_path.name}.*.bak"))
-            
-            if not backups:
-                logger.warning("No backups found", file=file_path)
-                return False
-            
-            # タイムスタンプでソート
-            backups.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            # バックアップを選択
-            if backup_time:
-                # 時間に一致するバックアップを検索
-                for backup in backups:
-                    if backup_time in str(backup):
-                        selected_backup = backup
-                        break
+            name = full_path.name
+            
+            # 他のインスタンス・プロセスがバックアップを作成していれば索引を作り直す
+            refreshed = False
+            stamp = self._current_backup_dir_stamp()
+            if stamp != self._backup_dir_stamp:
+                index = self._scan_backups()
+                with self._backup_lock:
+                    self._backup_index = index
+                    self._backup_dir_stamp = stamp
+                refreshed = True
+            
+            backups = self._backup_index.get(name, [])
+            selected_backup = self._select_backup(backups, backup_time)
+            if not refreshed and (selected_backup is None or not backup_time):
+                # 索引に無い場合や最新を求める場合はディレクトリを直接検索（mtimeの粒度が粗いファイルシステム対策）
+                backups = self._glob_backups(name)
+                selected_backup = self._select_backup(backups, backup_time)
+            
+            if selected_backup is None:
+                if not backups:
+                    logger.warning("No backups found", file=file_path)
                 else:
                     logger.warning("No backup found for time", time=backup_time)
-                    return False
-            else:
-                # 最新のものを使用
-                selected_backup = backups[0]
+                return False
             
             # 復元
             full_path.write_bytes(selected_backup.read_bytes())
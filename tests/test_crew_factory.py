@@ -0,0 +1,307 @@
+"""
+CrewFactoryのテスト
+"""
+
+import datetime
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import structlog
+import yaml
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crews import crew_factory
+from crews.crew_factory import CrewFactory
+from utils.config import get_config
+from utils.helpers import truncate_dict
+
+
+AGENTS = {
+    "writer_agent": {
+        "role": "Writer",
+        "goal": "Write clear reports",
+        "backstory": "Experienced technical writer",
+        "memory": False,
+    }
+}
+
+TASKS = {
+    "write_task": {
+        "description": "Write a short report",
+        "expected_output": "A report",
+        "agent": "writer_agent",
+    }
+}
+
+CREWS = {
+    "report_crew": {
+        "agents": ["writer_agent"],
+        "tasks": ["write_task"],
+        "process": "sequential",
+        "memory": False,
+    }
+}
+
+EXTRA_AGENT = {
+    "reviewer_agent": {"role": "Reviewer", "goal": "Review reports", "backstory": "Careful reviewer"}
+}
+
+
+def write_yaml(path: Path, data) -> None:
+    """YAMLファイルを書き込む"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.dump(data), encoding="utf-8")
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    """エージェント・タスク・クルー設定を書き込んだ設定ディレクトリ"""
+    monkeypatch.setenv("MONICA_API_KEY", "test_key")
+    # 知識ディレクトリの初期化はテスト用の一時ディレクトリで行う
+    monkeypatch.setattr(get_config(), "knowledge_dir", str(tmp_path / "knowledge"))
+    config_dir = tmp_path / "config"
+    write_yaml(config_dir / "agents" / "agents.yaml", AGENTS)
+    write_yaml(config_dir / "tasks" / "tasks.yaml", TASKS)
+    write_yaml(config_dir / "crews" / "crews.yaml", CREWS)
+    return config_dir
+
+
+class TestAgentCreation:
+    """エージェント生成のテストクラス"""
+
+    def test_agents_are_not_shared_between_crews(self, config_dir):
+        """同じ設定から作成したクルー同士でAgentインスタンスを共有しない"""
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        first = factory.create_crew("report_crew")
+        second = factory.create_crew("report_crew")
+
+        assert first.agents[0] is not second.agents[0]
+        assert first.agents[0].tools is not second.agents[0].tools
+
+    def test_reload_applies_changed_agent_config(self, config_dir):
+        """設定の再読み込み後は新しい設定でエージェントを作成する"""
+        factory = CrewFactory(config_dir=str(config_dir))
+        assert factory.create_agent("writer_agent").role == "Writer"
+
+        agents = {"writer_agent": {**AGENTS["writer_agent"], "role": "Editor"}}
+        write_yaml(config_dir / "agents" / "agents.yaml", agents)
+        factory.reload_configs()
+
+        assert factory.create_agent("writer_agent").role == "Editor"
+
+
+class TestCrewSignature:
+    """クルー設定のシグネチャのテストクラス"""
+
+    def test_non_dict_task_config_is_ignored(self, config_dir):
+        """辞書でないタスク設定があってもシグネチャの取得で失敗しない"""
+        write_yaml(config_dir / "tasks" / "tasks.yaml", {**TASKS, "broken_task": "not a mapping"})
+        crews = {"report_crew": {**CREWS["report_crew"], "tasks": ["write_task", "broken_task"]}}
+        write_yaml(config_dir / "crews" / "crews.yaml", crews)
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        signature = factory._crew_signature("report_crew")
+
+        assert "not a mapping" in signature
+        assert factory.agent_configs["writer_agent"] in signature
+
+
+class TestConfigDumpLogging:
+    """設定ダンプログのテストクラス"""
+
+    @pytest.fixture(autouse=True)
+    def restore_structlog(self):
+        saved = structlog.get_config()
+        yield
+        structlog.configure(**saved)
+
+    @pytest.fixture
+    def truncate_calls(self, monkeypatch):
+        """設定ダンプ用のtruncate_dictの呼び出しを記録する"""
+        calls = []
+
+        def record(config):
+            calls.append(config)
+            return truncate_dict(config)
+
+        monkeypatch.setattr(crew_factory, "truncate_dict", record)
+        return calls
+
+    def test_dump_skipped_when_debug_is_filtered(self, config_dir, truncate_calls):
+        """DEBUGが出力されない設定ではエージェント設定を整形しない"""
+        structlog.configure(
+            wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+            logger_factory=structlog.PrintLoggerFactory(),
+            cache_logger_on_first_use=False,
+        )
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        assert factory.create_agent("writer_agent") is not None
+        assert truncate_calls == []
+
+    def test_dump_follows_stdlib_logger_level(self, config_dir, truncate_calls):
+        """stdlib連携時は出力先ロガーのレベルで判定する"""
+        structlog.configure(
+            wrapper_class=structlog.stdlib.BoundLogger,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            cache_logger_on_first_use=False,
+        )
+        stdlib_logger = logging.getLogger(crew_factory.__name__)
+        original_level = stdlib_logger.level
+        factory = CrewFactory(config_dir=str(config_dir))
+        try:
+            stdlib_logger.setLevel(logging.INFO)
+            factory.create_task("write_task")
+            assert truncate_calls == []
+
+            stdlib_logger.setLevel(logging.DEBUG)
+            factory.create_task("write_task")
+            assert len(truncate_calls) == 1
+        finally:
+            stdlib_logger.setLevel(original_level)
+
+
+class TestConfigDiskCache:
+    """パース済み設定のディスクキャッシュのテストクラス"""
+
+    @pytest.fixture
+    def restart(self, monkeypatch):
+        """プロセス内の設定キャッシュを空にしてプロセスの再起動を再現する"""
+        def clear():
+            monkeypatch.setattr(CrewFactory, "_YAML_CACHE", {})
+            monkeypatch.setattr(CrewFactory, "_MERGED_CONFIGS", {})
+
+        clear()
+        return clear
+
+    def test_disabled_by_default(self, config_dir, tmp_path, monkeypatch, restart):
+        """OKAMI_CONFIG_CACHE_DIR未指定ではキャッシュを書き込まない"""
+        monkeypatch.setattr(crew_factory, "_CONFIG_CACHE_DIR", "")
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        assert factory.list_agents() == ["writer_agent"]
+        assert not (tmp_path / "home" / ".cache" / "okami").exists()
+
+    def test_cache_is_stored_as_json(self, config_dir, tmp_path, monkeypatch, restart):
+        """指定したディレクトリにパース結果をJSONで保存する"""
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr(crew_factory, "_CONFIG_CACHE_DIR", str(cache_dir))
+
+        factory = CrewFactory(config_dir=str(config_dir))
+        factory.list_agents()
+        factory.list_tasks()
+
+        cached = [json.loads(path.read_bytes()) for path in cache_dir.iterdir()]
+        assert [path.suffix for path in cache_dir.iterdir()] == [".json"] * 3
+        assert {"writer_agent": AGENTS["writer_agent"]} in [entry["data"] for entry in cached]
+
+    def test_changed_content_with_same_stamp_is_reloaded(self, config_dir, tmp_path, monkeypatch, restart):
+        """mtime・サイズが同じでも内容が変わった設定は再起動後にキャッシュを使わない"""
+        monkeypatch.setattr(crew_factory, "_CONFIG_CACHE_DIR", str(tmp_path / "cache"))
+        CrewFactory(config_dir=str(config_dir))
+
+        agents_file = config_dir / "agents" / "agents.yaml"
+        stat = agents_file.stat()
+        agents_file.write_text(agents_file.read_text(encoding="utf-8").replace("Writer", "Editor"), encoding="utf-8")
+        os.utime(agents_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        restart()
+
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        assert factory.agent_configs["writer_agent"]["role"] == "Editor"
+
+    def test_values_not_representable_in_json_are_kept(self, config_dir, tmp_path, monkeypatch, restart):
+        """JSONで同じ値に戻らない設定（日付）は再起動後も同じ型で読み込む"""
+        monkeypatch.setattr(crew_factory, "_CONFIG_CACHE_DIR", str(tmp_path / "cache"))
+        tasks = {"write_task": {**TASKS["write_task"], "deadline": datetime.date(2024, 1, 1)}}
+        write_yaml(config_dir / "tasks" / "tasks.yaml", tasks)
+        CrewFactory(config_dir=str(config_dir))
+        restart()
+
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        assert factory.task_configs["write_task"]["deadline"] == datetime.date(2024, 1, 1)
+
+
+class TestYamlFileListing:
+    """設定ディレクトリのファイル一覧キャッシュのテストクラス"""
+
+    def test_file_added_within_mtime_granularity_is_found(self, config_dir):
+        """追加後もディレクトリのmtimeが変わらない場合でも、直近の変更であれば新しいファイルを読み込む"""
+        agents_dir = config_dir / "agents"
+        CrewFactory(config_dir=str(config_dir))
+
+        # 粒度の粗いファイルシステムを想定し、追加後もmtimeを変えない
+        stat = agents_dir.stat()
+        write_yaml(agents_dir / "reviewer.yaml", EXTRA_AGENT)
+        os.utime(agents_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        assert sorted(factory.list_agents()) == ["reviewer_agent", "writer_agent"]
+
+    def test_reload_rescans_unchanged_directory(self, config_dir):
+        """明示的な再読み込みではmtimeが変わらなくてもファイル一覧を取り直す"""
+        agents_dir = config_dir / "agents"
+        old_mtime_ns = 1_000_000_000_000_000_000
+        os.utime(agents_dir, ns=(old_mtime_ns, old_mtime_ns))
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        write_yaml(agents_dir / "reviewer.yaml", EXTRA_AGENT)
+        os.utime(agents_dir, ns=(old_mtime_ns, old_mtime_ns))
+        factory.reload_configs()
+
+        assert sorted(factory.list_agents()) == ["reviewer_agent", "writer_agent"]
+
+
+class TestReloadConfigs:
+    """設定再読み込みのテストクラス"""
+
+    def test_explicit_calls_always_reload(self, config_dir, monkeypatch):
+        """既定では連続して呼び出しても毎回再読み込みする"""
+        monkeypatch.setattr(crew_factory, "_RELOAD_MIN_INTERVAL", 60.0)
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        assert factory.reload_configs() is True
+        write_yaml(config_dir / "agents" / "reviewer.yaml", EXTRA_AGENT)
+        assert factory.reload_configs() is True
+
+        assert sorted(factory.list_agents()) == ["reviewer_agent", "writer_agent"]
+
+    def test_debounced_reload_reports_skip(self, config_dir, monkeypatch):
+        """force=Falseでは間隔内の呼び出しをスキップし、Falseを返す"""
+        monkeypatch.setattr(crew_factory, "_RELOAD_MIN_INTERVAL", 60.0)
+        factory = CrewFactory(config_dir=str(config_dir))
+
+        assert factory.reload_configs(force=False) is True
+        write_yaml(config_dir / "agents" / "reviewer.yaml", EXTRA_AGENT)
+        assert factory.reload_configs(force=False) is False
+        assert factory.list_agents() == ["writer_agent"]
+
+        monkeypatch.setattr(crew_factory, "_RELOAD_MIN_INTERVAL", 0.0)
+        assert factory.reload_configs(force=False) is True
+        assert sorted(factory.list_agents()) == ["reviewer_agent", "writer_agent"]
+
+
+class TestKnowledgeManager:
+    """KnowledgeManagerの生成のテストクラス"""
+
+    def test_factories_do_not_share_knowledge_sources(self, config_dir):
+        """同じ設定のファクトリー同士でも知識ソースの登録は共有しない"""
+        first = CrewFactory(config_dir=str(config_dir))
+        second = CrewFactory(config_dir=str(config_dir))
+        sources_before = list(second._knowledge_manager.crew_sources)
+
+        first._knowledge_manager.add_crew_knowledge_batch(["Reports are written in Japanese."])
+
+        assert len(first._knowledge_manager.crew_sources) == len(sources_before) + 1
+        assert second._knowledge_manager.crew_sources == sources_before
@@ -0,0 +1,103 @@
+"""
+EmbeddingManagerのキャッシュのテスト
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.embedding_manager import EmbeddingManager, _simhash
+
+
+DOCUMENT = "The agent must validate every tool output before writing the final report to the user."
+NEGATED = "The agent must not validate every tool output before writing the final report to the user."
+
+
+class FakeOllamaClient:
+    """ollama.Clientの代替（プロンプトの長さと呼び出し順からベクトルを作る）"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def embeddings(self, model, prompt):
+        self.prompts.append(prompt)
+        return {"embedding": [float(len(prompt)), float(len(self.prompts))]}
+
+
+class TestEmbeddingCache:
+    """エンベディングキャッシュのテストクラス"""
+
+    @pytest.fixture
+    def manager(self):
+        """既定設定のEmbeddingManager"""
+        manager = EmbeddingManager({"provider": "ollama", "config": {}})
+        manager.client = FakeOllamaClient()
+        return manager
+
+    @pytest.fixture
+    def fuzzy_manager(self):
+        """SimHashの近似一致を有効にしたEmbeddingManager"""
+        manager = EmbeddingManager({"provider": "ollama", "config": {"simhash_max_distance": 3}})
+        manager.client = FakeOllamaClient()
+        return manager
+
+    def test_exact_repeat_is_served_from_cache(self, manager):
+        """同じテキストは再度エンベディングしない"""
+        first = manager.generate_embeddings([DOCUMENT])
+        second = manager.generate_embeddings([DOCUMENT])
+
+        assert first == second
+        assert manager.client.prompts == [DOCUMENT]
+        assert manager.stats["cache_hits"] == 1
+
+    def test_fuzzy_reuse_disabled_by_default(self, manager):
+        """既定では近似一致を使わず、意味の違う文は別々にエンベディングする"""
+        first = manager.generate_query_embedding(DOCUMENT)
+        second = manager.generate_query_embedding(NEGATED)
+
+        assert first != second
+        assert manager.client.prompts == [DOCUMENT, NEGATED]
+
+    def test_documents_never_use_fuzzy_reuse(self, fuzzy_manager):
+        """近似一致を有効にしてもドキュメントのエンベディングには適用しない"""
+        assert (_simhash(DOCUMENT) ^ _simhash(NEGATED)).bit_count() <= 3
+
+        embeddings = fuzzy_manager.generate_embeddings([DOCUMENT, NEGATED])
+
+        assert embeddings[0] != embeddings[1]
+        assert fuzzy_manager.stats["fuzzy_cache_hits"] == 0
+
+    def test_queries_reuse_near_duplicates_when_enabled(self, fuzzy_manager):
+        """有効時は検索クエリのみほぼ同一のテキストのエンベディングを再利用する"""
+        first = fuzzy_manager.generate_query_embedding(DOCUMENT)
+        second = fuzzy_manager.generate_query_embedding(NEGATED)
+
+        assert first == second
+        assert fuzzy_manager.client.prompts == [DOCUMENT]
+        assert fuzzy_manager.stats["fuzzy_cache_hits"] == 1
+
+    def test_concurrent_cache_access(self, manager):
+        """複数スレッドから同時に使用しても各テキストに対応するエンベディングを返す"""
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(200):
+                    text = f"query {offset} {'x' * (i % 20)}"
+                    embedding = manager.generate_embeddings([text])[0]
+                    assert embedding[0] == float(len(text))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
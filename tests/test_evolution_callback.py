@@ -0,0 +1,121 @@
+"""
+EvolutionCallbackのテスト（同期処理・バックグラウンド処理）
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.evolution_tracker import EvolutionTracker
+from core.knowledge_graph import KnowledgeGraphManager
+from evolution.evolution_callback import EvolutionCallback
+
+
+class FakeEngine:
+    """AdaptiveEvolutionEngineの代替（呼び出し回数を記録）"""
+
+    def __init__(self, release: threading.Event = None):
+        self.release = release
+        self.calls = 0
+
+    def analyze_performance_trends(self):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        return {
+            "status": "analyzed",
+            "system_trend": {"trend": "improving"},
+            "improvement_areas": [],
+            "recommendations": [{"target": "agent", "confidence": 0.9}],
+        }
+
+    def apply_adaptations(self, recommendations, dry_run):
+        return {"applied": [], "skipped": list(recommendations), "failed": []}
+
+    def get_adaptation_report(self):
+        return {}
+
+
+class FakeCrewOutput:
+    def __init__(self):
+        self.json_dict = None
+
+
+class TestEvolutionCallback:
+    """EvolutionCallbackのテストクラス"""
+
+    @pytest.fixture
+    def make_callback(self, tmp_path):
+        callbacks = []
+
+        def factory(engine, **kwargs):
+            callback = EvolutionCallback(
+                evolution_tracker=EvolutionTracker(storage_dir=str(tmp_path / "evolution")),
+                knowledge_graph=KnowledgeGraphManager(storage_path=str(tmp_path / "knowledge_graph")),
+                **kwargs
+            )
+            callback._adaptive_engine = engine
+            callbacks.append(callback)
+            return callback
+
+        yield factory
+        for callback in callbacks:
+            assert callback.shutdown(timeout=5)
+
+    def test_default_is_synchronous(self, make_callback):
+        """デフォルトでは結果がクルー出力に直接入る"""
+        callback = make_callback(FakeEngine())
+
+        output = callback.on_crew_complete(FakeCrewOutput())
+
+        result = output.json_dict["adaptive_evolution"]
+        assert "trends" in result
+        assert "dry_run_results" in result
+        assert "status" not in result
+
+    def test_background_queues_and_records_result(self, make_callback):
+        """バックグラウンド処理では投入状態を返し、結果はlast_resultに入る"""
+        release = threading.Event()
+        engine = FakeEngine(release)
+        callback = make_callback(engine, background=True)
+
+        output = callback.on_crew_complete(FakeCrewOutput())
+        assert output.json_dict["adaptive_evolution"]["status"] == "queued"
+        assert callback.last_result is None
+
+        release.set()
+        callback.wait_until_idle()
+
+        assert callback.last_result["version"] == 1
+        assert "dry_run_results" in callback.last_result
+        assert engine.calls == 1
+
+    def test_background_skips_stale_requests(self, make_callback):
+        """処理中に複数投入された場合は最新の投入のみ分析する"""
+        release = threading.Event()
+        engine = FakeEngine(release)
+        callback = make_callback(engine, background=True)
+
+        for _ in range(3):
+            callback.on_crew_complete(FakeCrewOutput())
+        release.set()
+        callback.wait_until_idle()
+
+        assert callback.last_result["version"] == 3
+        # 2件目は3件目より古いため必ず破棄される（1件目は処理開始のタイミング次第）
+        assert engine.calls <= 2
+
+    def test_shutdown_joins_worker(self, make_callback):
+        """shutdownでワーカースレッドの終了を待機できる"""
+        callback = make_callback(FakeEngine(), background=True)
+
+        callback.on_crew_complete(FakeCrewOutput())
+
+        assert callback.shutdown(timeout=5)
+        assert callback._worker is None
+        assert callback.last_result is not None
@@ -0,0 +1,160 @@
+"""
+ImprovementApplierのファイル更新・バックアップのテスト
+"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from evolution.improvement_applier import ImprovementApplier
+
+
+class TestImprovementApplier:
+    """ImprovementApplierのテストクラス"""
+
+    @pytest.fixture
+    def applier(self, tmp_path):
+        return ImprovementApplier(base_path=str(tmp_path))
+
+    def test_update_field_skips_non_yaml_file(self, applier, tmp_path):
+        """YAML以外のファイルはパースせずにスキップする"""
+        target = tmp_path / "notes.md"
+        target.write_text("key: [unclosed\n", encoding="utf-8")
+
+        result = applier._apply_update_field(target, {"field": "key", "value": 1}, dry_run=False)
+
+        assert result["status"] == "skipped"
+        assert result["reason"] == "Not a YAML file"
+
+    def test_update_field_skips_missing_file(self, applier, tmp_path):
+        """存在しないファイルはスキップする"""
+        result = applier._apply_update_field(tmp_path / "missing.yaml", {"field": "a", "value": 1}, dry_run=False)
+
+        assert result["status"] == "skipped"
+        assert result["reason"] == "File does not exist"
+
+    def test_update_field_writes_nested_value(self, applier, tmp_path):
+        """ネストされたフィールドを更新して書き込む"""
+        target = tmp_path / "agent.yaml"
+        target.write_text("agent:\n  max_iter: 10\n", encoding="utf-8")
+
+        result = applier._apply_update_field(target, {"field": "agent.max_iter", "value": 20}, dry_run=False)
+        # 同じファイルを続けて更新しても、書き込み後の内容が読み込まれる
+        applier._apply_update_field(target, {"field": "agent.verbose", "value": True}, dry_run=False)
+
+        assert result["status"] == "applied"
+        assert target.read_text(encoding="utf-8") == "agent:\n  max_iter: 20\n  verbose: true\n"
+
+    def test_yaml_add_invalid_content_is_appended_as_comment(self, applier, tmp_path):
+        """YAMLとして解析できない内容はコメントとして追記する"""
+        target = tmp_path / "agent.yaml"
+        target.write_text("# keep\nagent: {}\n", encoding="utf-8")
+
+        result = applier._apply_yaml_add(target, "bad: [unclosed", dry_run=False)
+
+        assert result["added_as_comment"] is True
+        assert target.read_text(encoding="utf-8") == "# keep\nagent: {}\n\n# Evolution update: bad: [unclosed\n"
+
+    def test_restore_finds_backup_created_by_another_instance(self, applier, tmp_path):
+        """別インスタンスが作成したバックアップも復元できる"""
+        target = tmp_path / "agent.yaml"
+        target.write_text("version: 1\n", encoding="utf-8")
+        backup_path = ImprovementApplier(base_path=str(tmp_path))._create_backup(target)
+        target.write_text("version: 2\n", encoding="utf-8")
+
+        assert applier.restore_backup("agent.yaml") is True
+        assert target.read_text(encoding="utf-8") == "version: 1\n"
+
+        timestamp = backup_path.name[len("agent.yaml."):-len(".bak")]
+        target.write_text("version: 3\n", encoding="utf-8")
+        assert applier.restore_backup("agent.yaml", backup_time=timestamp) is True
+        assert target.read_text(encoding="utf-8") == "version: 1\n"
+
+    def test_restore_falls_back_to_glob_when_index_is_stale(self, applier, tmp_path):
+        """ディレクトリのmtimeが変化しなくても索引に無いバックアップを検索する"""
+        target = tmp_path / "agent.yaml"
+        target.write_text("version: 1\n", encoding="utf-8")
+        (applier.backup_dir / "agent.yaml.20240101_000000.bak").write_text("version: 0\n", encoding="utf-8")
+        # mtime粒度が粗いファイルシステムを想定して索引の更新を抑止
+        applier._backup_dir_stamp = applier._current_backup_dir_stamp()
+
+        assert applier.restore_backup("agent.yaml", backup_time="20240101_000000") is True
+        assert target.read_text(encoding="utf-8") == "version: 0\n"
+        assert applier.restore_backup("agent.yaml", backup_time="19990101_000000") is False
+
+    def test_restore_latest_includes_backups_from_other_instances(self, applier, tmp_path):
+        """自身のバックアップ作成後に別インスタンスが作成したものも最新として復元する"""
+        target = tmp_path / "agent.yaml"
+        target.write_text("version: 1\n", encoding="utf-8")
+        applier._create_backup(target)
+        target.write_text("version: 2\n", encoding="utf-8")
+        ImprovementApplier(base_path=str(tmp_path))._create_backup(target)
+        target.write_text("version: 3\n", encoding="utf-8")
+        # mtime粒度が粗いファイルシステムを想定して索引の更新を抑止
+        applier._backup_dir_stamp = applier._current_backup_dir_stamp()
+
+        assert applier.restore_backup("agent.yaml") is True
+        assert target.read_text(encoding="utf-8") == "version: 2\n"
+
+    def test_backups_in_the_same_second_do_not_collide(self, applier, tmp_path):
+        """同一秒内のバックアップも連番で別名になり、最新のものから復元される"""
+        target = tmp_path / "agent.yaml"
+        target.write_text("version: 1\n", encoding="utf-8")
+        first = applier._create_backup(target)
+        target.write_text("version: 2\n", encoding="utf-8")
+        second = ImprovementApplier(base_path=str(tmp_path))._create_backup(target)
+        target.write_text("version: 3\n", encoding="utf-8")
+
+        assert first != second
+        assert first.read_text(encoding="utf-8") == "version: 1\n"
+        assert applier.restore_backup("agent.yaml") is True
+        assert target.read_text(encoding="utf-8") == "version: 2\n"
+
+    def test_intelligent_update_marks_each_section_once(self, applier):
+        """既に更新行で終わっているセクションは飛ばし、未反映のセクションのみ更新する"""
+        change = "update timeout to 30"
+        content = f"timeout: 10\n# Updated: {change}\n\ntimeout_retry: 3\n"
+
+        updated, changed = applier._intelligent_update(content, change)
+
+        assert changed is True
+        assert updated == f"timeout: 10\n# Updated: {change}\n\ntimeout_retry: 3\n# Updated: {change}\n"
+        assert applier._intelligent_update(updated, change) == (updated, False)
+
+    def test_intelligent_update_matches_suggestion_line_exactly(self, applier):
+        """コメントの追加済み判定は同じ内容の行が丸ごとある場合のみ"""
+        content = "# Evolution suggestion: add retries later\n"
+
+        updated, changed = applier._intelligent_update(content, "add retries")
+
+        assert changed is True
+        assert updated == content + "\n# Evolution suggestion: add retries\n"
+        assert applier._intelligent_update(updated, "add retries") == (updated, False)
+
+    def test_new_yaml_file_follows_umask(self, applier, tmp_path):
+        """一時ファイル経由で新規作成したファイルもumaskに従ったパーミッションになる"""
+        target = tmp_path / "config" / "new.yaml"
+        umask = os.umask(0o022)
+        try:
+            result = applier._apply_yaml_add(target, "agent: {}", dry_run=False)
+        finally:
+            os.umask(umask)
+
+        assert result["status"] == "applied"
+        assert stat.S_IMODE(target.stat().st_mode) == 0o644
+
+    def test_existing_file_keeps_its_mode(self, applier, tmp_path):
+        """既存ファイルの置き換えでは元のパーミッションを維持する"""
+        target = tmp_path / "agent.yaml"
+        target.write_text("agent:\n  max_iter: 10\n", encoding="utf-8")
+        target.chmod(0o640)
+
+        applier._apply_update_field(target, {"field": "agent.max_iter", "value": 20}, dry_run=False)
+
+        assert stat.S_IMODE(target.stat().st_mode) == 0o640
@@ -0,0 +1,153 @@
+"""
+ChromaVectorStoreのテスト
+"""
+
+import ssl
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from chromadb.api.fastapi import FastAPI
+from chromadb.config import Settings, System
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.vector_store import ChromaVectorStore
+
+
+QUERY = [1.0, 0.0, 0.0]
+
+
+def upsert(store, doc_id, document):
+    """1件のドキュメントを書き込む"""
+    store.upsert(
+        "docs",
+        embeddings=[QUERY],
+        documents=[document],
+        metadatas=[{"source": doc_id}],
+        ids=[doc_id]
+    )
+
+
+class TestQueryCache:
+    """クエリ結果キャッシュのテストクラス"""
+
+    @pytest.fixture
+    def persist_dir(self, tmp_path, monkeypatch):
+        """キャッシュ設定を環境変数から外した永続化ディレクトリ"""
+        monkeypatch.delenv("CHROMA_QUERY_CACHE_SIZE", raising=False)
+        monkeypatch.delenv("CHROMA_SEMANTIC_CACHE_THRESHOLD", raising=False)
+        return str(tmp_path / "chroma")
+
+    @pytest.fixture
+    def store(self, persist_dir):
+        """既定設定（キャッシュ無効）のストア"""
+        store = ChromaVectorStore(persist_directory=persist_dir)
+        store.create_collection("docs", dimension=3)
+        return store
+
+    @pytest.fixture
+    def cached_store(self, persist_dir, monkeypatch):
+        """クエリ結果キャッシュを有効にしたストア"""
+        monkeypatch.setenv("CHROMA_QUERY_CACHE_SIZE", "8")
+        store = ChromaVectorStore(persist_directory=persist_dir)
+        store.create_collection("docs", dimension=3)
+        return store
+
+    def test_disabled_by_default(self, store):
+        """既定ではキャッシュせず、ストアを経由しない書き込みも次のクエリに反映される"""
+        upsert(store, "a", "first")
+        assert store.query("docs", QUERY, n_results=1)["documents"][0] == ["first"]
+
+        store.client.get_collection("docs").upsert(
+            ids=["a"], embeddings=[QUERY], documents=["second"], metadatas=[{"source": "a"}]
+        )
+
+        assert store.query("docs", QUERY, n_results=1)["documents"][0] == ["second"]
+
+    def test_cached_results_are_not_shared(self, cached_store):
+        """取得した結果を変更しても以降のキャッシュヒットに影響しない"""
+        upsert(cached_store, "a", "first")
+
+        first = cached_store.query("docs", QUERY, n_results=1)
+        first["metadatas"][0][0]["source"] = "mutated"
+        second = cached_store.query("docs", QUERY, n_results=1)
+        second["documents"][0].clear()
+        third = cached_store.query("docs", QUERY, n_results=1)
+
+        assert third["metadatas"][0][0]["source"] == "a"
+        assert third["documents"][0] == ["first"]
+
+    def test_upsert_from_another_instance_invalidates(self, cached_store, persist_dir):
+        """同じクライアントを共有する別インスタンスの書き込みでキャッシュが破棄される"""
+        other = ChromaVectorStore(persist_directory=persist_dir)
+        upsert(cached_store, "a", "first")
+        assert cached_store.query("docs", QUERY, n_results=1)["documents"][0] == ["first"]
+
+        upsert(other, "a", "second")
+
+        assert cached_store.query("docs", QUERY, n_results=1)["documents"][0] == ["second"]
+
+
+    def test_results_invalidated_during_query_are_not_cached(self, cached_store, persist_dir, monkeypatch):
+        """クエリ実行中に書き込みで無効化された場合、その古い結果はキャッシュしない"""
+        other = ChromaVectorStore(persist_directory=persist_dir)
+        upsert(cached_store, "a", "first")
+        query_with_retry = ChromaVectorStore._query_with_retry
+
+        def query_then_write(self, *args, **kwargs):
+            results = query_with_retry(self, *args, **kwargs)
+            monkeypatch.setattr(ChromaVectorStore, "_query_with_retry", query_with_retry)
+            upsert(other, "a", "second")
+            return results
+
+        monkeypatch.setattr(ChromaVectorStore, "_query_with_retry", query_then_write)
+        assert cached_store.query("docs", QUERY, n_results=1)["documents"][0] == ["first"]
+
+        assert cached_store.query("docs", QUERY, n_results=1)["documents"][0] == ["second"]
+
+
+class TestHttpPoolTuning:
+    """HttpClientのコネクションプール拡張のテスト"""
+
+    def test_pool_resize_preserves_session_settings(self, monkeypatch):
+        """プール拡張後もTLS検証・認証・タイムアウト・ヘッダーを維持する"""
+        monkeypatch.setenv("CHROMA_HTTP_POOL_SIZE", "32")
+        settings = Settings(
+            chroma_api_impl="chromadb.api.fastapi.FastAPI",
+            chroma_server_host="localhost",
+            chroma_server_http_port=8000,
+            chroma_server_ssl_verify=False,
+        )
+        server = System(settings).instance(FastAPI)
+        session = server._session
+        session.auth = httpx.BasicAuth("user", "secret")
+        session.headers["X-Chroma-Token"] = "token"
+
+        ChromaVectorStore._tune_http_pool(SimpleNamespace(_server=server))
+
+        tuned = server._session
+        assert tuned is not session
+        assert tuned.auth is session.auth
+        assert tuned.headers["X-Chroma-Token"] == "token"
+        assert tuned.timeout == session.timeout
+        assert tuned._transport._pool._ssl_context.verify_mode == ssl.CERT_NONE
+        tuned.close()
+
+    def test_pool_untouched_without_setting(self, monkeypatch):
+        """CHROMA_HTTP_POOL_SIZE未設定時はセッションを置き換えない"""
+        monkeypatch.delenv("CHROMA_HTTP_POOL_SIZE", raising=False)
+        settings = Settings(
+            chroma_api_impl="chromadb.api.fastapi.FastAPI",
+            chroma_server_host="localhost",
+            chroma_server_http_port=8000,
+        )
+        server = System(settings).instance(FastAPI)
+        session = server._session
+
+        ChromaVectorStore._tune_http_pool(SimpleNamespace(_server=server))
+
+        assert server._session is session
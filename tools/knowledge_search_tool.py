@@ -8,6 +8,7 @@ from crewai.tools import tool
 from core.vector_store import get_vector_store
 import structlog
 import os
+import numpy as np
 
 logger = structlog.get_logger()
 
@@ -64,18 +65,21 @@ class KnowledgeSearcher:
                 filter=filter
             )
             
-            # 結果を整形
-            formatted_results = []
-            if results.get("documents") and results["documents"][0]:
-                for i, doc in enumerate(results["documents"][0]):
-                    result = {
-                        "content": doc,
-                        "metadata": results["metadatas"][0][i] if results.get("metadatas") else {},
-                        "score": 1 - results["distances"][0][i] if results.get("distances") else 0.0
-                    }
-                    formatted_results.append(result)
+            # 結果を整形（バッチ先頭の結果リストを一度だけ取り出してzipで走査）
+            documents = (results.get("documents") or [[]])[0]
+            if not documents:
+                return []
+            metadatas = (results.get("metadatas") or [None])[0] or [{} for _ in documents]
+            distances = (results.get("distances") or [None])[0]
+            if distances:
+                scores = (1.0 - np.asarray(distances, dtype=np.float64)).tolist()
+            else:
+                scores = [0.0] * len(documents)
             
-            return formatted_results
+            return [
+                {"content": doc, "metadata": metadata, "score": score}
+                for doc, metadata, score in zip(documents, metadatas, scores)
+            ]
             
         except Exception as e:
             logger.error(f"Knowledge search failed: {e}")